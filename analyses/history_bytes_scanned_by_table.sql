@@ -0,0 +1,29 @@
+-- analyses/history_bytes_scanned_by_table.sql
+-- Bytes actually processed by the queries (dashboards, ad-hoc) that read the
+-- history event tables vs the rollup marts, from the BigQuery job history.
+-- Run it after the dashboards have been switched to the rollups.
+
+select
+    referenced.table_id                                         as referenced_table,
+    count(*)                                                    as queries,
+    round(sum(jobs.total_bytes_processed) / pow(10, 9), 3)      as gb_processed,
+    round(avg(jobs.total_bytes_processed) / pow(10, 6), 1)      as avg_mb_per_query,
+    round(avg(timestamp_diff(jobs.end_time, jobs.start_time, millisecond)))
+                                                                as avg_elapsed_ms
+
+from `region-eu`.INFORMATION_SCHEMA.JOBS_BY_PROJECT as jobs,
+    unnest(jobs.referenced_tables) as referenced
+
+where jobs.creation_time >= timestamp_sub(current_timestamp(), interval {{ var('bytes_report_days', 30) }} day)
+  and jobs.job_type = 'QUERY'
+  and jobs.statement_type = 'SELECT'
+  and jobs.state = 'DONE'
+  and referenced.table_id in (
+      'int_merged_history',
+      'int_kpi_core_history',
+      'mart_kpi_history_hourly_track',
+      'mart_kpi_history_daily_genre'
+  )
+
+group by referenced_table
+order by gb_processed desc
@@ -0,0 +1,27 @@
+-- analyses/history_dashboard_from_events.sql
+-- BEFORE: the history dashboard queries answered from listening events
+-- (1 row per play). Compare its bytes with history_dashboard_from_rollups.sql:
+--
+--   dbt compile -s history_dashboard_from_events history_dashboard_from_rollups
+--   bq query --dry_run --use_legacy_sql=false < target/compiled/Ytmusic_analytics_V2/analyses/history_dashboard_from_events.sql
+--   bq query --dry_run --use_legacy_sql=false < target/compiled/Ytmusic_analytics_V2/analyses/history_dashboard_from_rollups.sql
+
+-- daily volume, last 90 days
+select
+    listen_date,
+    count(*)                            as listens,
+    sum(duration_minutes)               as minutes_listened
+from {{ ref('int_kpi_core_history') }}
+where listen_date >= date_sub(current_date(), interval 90 day)
+group by listen_date;
+
+-- genre split, last 90 days
+select
+    listen_date,
+    main_genre,
+    count(*)                            as listens,
+    sum(duration_minutes)               as minutes_listened
+from {{ ref('int_kpi_core_history') }}
+where listen_date >= date_sub(current_date(), interval 90 day)
+  and main_genre is not null
+group by listen_date, main_genre;
@@ -0,0 +1,23 @@
+-- analyses/history_dashboard_from_rollups.sql
+-- AFTER: the same dashboard queries as history_dashboard_from_events.sql,
+-- answered from the rollup marts (1 row per day x hour x track / day x genre).
+
+-- daily volume, last 90 days
+select
+    listen_date,
+    sum(listens)                        as listens,
+    sum(minutes_listened)               as minutes_listened
+from {{ ref('mart_kpi_history_hourly_track') }}
+where listen_date >= date_sub(current_date(), interval 90 day)
+group by listen_date;
+
+-- genre split, last 90 days
+select
+    listen_date,
+    main_genre,
+    sum(listens)                        as listens,
+    sum(minutes_listened)               as minutes_listened
+from {{ ref('mart_kpi_history_daily_genre') }}
+where listen_date >= date_sub(current_date(), interval 90 day)
+  and main_genre is not null
+group by listen_date, main_genre;
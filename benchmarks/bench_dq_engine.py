@@ -0,0 +1,123 @@
+"""
+Benchmark — per-check pandas scans vs the single-pass DQ engine.
+
+Writes a synthetic watch history (with missing IDs, unparsed timestamps and
+future plays) to an interim Parquet file. Runs the watch-history checks both
+ways, each in a fresh process:
+- the previous approach: read every column into pandas, then one full
+  scan per check
+- the engine (src/dq/engine.py): one streamed pass with all rules fused
+
+Checks that both produce the same values, then reports time and peak RSS.
+
+Usage (from the project root):
+    python -m benchmarks.bench_dq_engine --rows 5000000
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from queue import Empty
+
+import pandas as pd
+
+from benchmarks.bench_warehouse_load import make_history
+from src.common.interim import WATCH_HISTORY, read_interim, write_interim
+from src.dq.engine import COUNT, evaluate
+from src.history.b1_extract_load.dq_check_watch_history_youtube_music import RULES
+
+COLUMNS = ["track_id", "title", "artist", "played_at", "source"]
+
+
+def pandas_checks(path: Path) -> dict:
+    df = read_interim(WATCH_HISTORY, columns=COLUMNS, path=path)
+    plays = df.groupby(["track_id", "source"], dropna=False).size()
+    return {
+        "row_count": len(df),
+        "missing_track_id": df["track_id"].isna().sum(),
+        "missing_title": df["title"].isna().sum(),
+        "missing_artist": df["artist"].isna().sum(),
+        "missing_played_at": df["played_at"].isna().sum(),
+        "invalid_played_at_format": df["played_at"].isna().sum(),
+        "future_plays": (df["played_at"] > datetime.now(timezone.utc)).sum(),
+        "total_replays": plays[plays > 1].sum(),
+    }
+
+
+def engine_checks(path: Path) -> dict:
+    result = evaluate(RULES, path)
+    plays = result["plays_per_track"][COUNT].to_pandas()
+    return {**{row["check"]: row["value"] for row in result.checks()}, "total_replays": plays[plays > 1].sum()}
+
+
+def write_history(path: Path, n_rows: int):
+    df = make_history(n_rows)
+    df.loc[df.index % 97 == 0, "track_id"] = None
+    df.loc[df.index % 101 == 0, "played_at"] = pd.NaT
+    df.loc[df.index % 1009 == 0, "played_at"] = pd.Timestamp("2100-01-01", tz="UTC")
+    write_interim(df, WATCH_HISTORY, path)
+
+
+def _write(path, n_rows, queue):
+    write_history(path, n_rows)
+    queue.put(None)
+
+
+def _run(method, path, queue):
+    start = time.perf_counter()
+    values = {name: int(value) for name, value in method(path).items()}
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != "darwin" else 1024 ** 2)
+    queue.put((values, seconds, peak_mb))
+
+
+def in_process(target, *args):
+    # Fresh process: peak RSS is not inherited from the data generation
+    # or polluted by the other method
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=target, args=(*args, queue))
+    process.start()
+
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except Empty:
+            # A child that died (e.g. on an exception) never reports: stop
+            # instead of waiting forever
+            if process.exitcode is not None and queue.empty():
+                sys.exit(f"❌ {target.__name__} failed in its child process (exit code {process.exitcode})")
+
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "watch_history.parquet"
+        in_process(_write, path, args.rows)
+
+        baseline, baseline_s, baseline_mb = in_process(_run, pandas_checks, path)
+        fused, fused_s, fused_mb = in_process(_run, engine_checks, path)
+
+    if baseline != fused:
+        sys.exit(f"❌ Results differ:\n  pandas: {baseline}\n  engine: {fused}")
+
+    print(f"✅ Same {len(fused)} check values on {args.rows:,} rows")
+    print(f"{'method':>22} {'seconds':>8} {'peak RSS MB':>12}")
+    print(f"{'pandas, scan per check':>22} {baseline_s:>8.2f} {baseline_mb:>12.0f}")
+    print(f"{'engine, single pass':>22} {fused_s:>8.2f} {fused_mb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
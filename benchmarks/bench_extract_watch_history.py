@@ -0,0 +1,154 @@
+"""
+Benchmark — watch-history extraction (peak RSS & wall time).
+
+Generates synthetic Takeout watch-history.json files and runs the extractor
+on each of them in a fresh subprocess, so the reported peak RSS belongs to
+that single run. The old `json.load` approach is measured as a baseline.
+
+Usage (from the project root):
+    python -m benchmarks.bench_extract_watch_history
+    python -m benchmarks.bench_extract_watch_history --events 1000000 10000000
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = PROJECT_ROOT / "data" / "bench" / "watch_history"
+
+
+# ============================================================
+# SYNTHETIC DATA
+# ============================================================
+
+def generate_watch_history(path: Path, n_events: int, seed: int = 42):
+    """Write a Takeout-like watch-history.json with ~90% YouTube Music events."""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(n_events):
+            video_id = f"vid{rng.randrange(50_000):08d}"
+            event = {
+                "header": "YouTube Music" if rng.random() < 0.9 else "YouTube",
+                "title": f"Watched Song {video_id}",
+                "titleUrl": f"https://music.youtube.com/watch?v={video_id}",
+                "subtitles": [{
+                    "name": f"Artist {rng.randrange(5_000)} - Topic",
+                    "url": "https://www.youtube.com/channel/UC000",
+                }],
+                "time": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                        f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00.000Z",
+                "products": ["YouTube"],
+                "activityControls": ["YouTube watch history"],
+            }
+            f.write(",\n" if i else "\n")
+            json.dump(event, f, ensure_ascii=False)
+        f.write("\n]")
+
+
+# ============================================================
+# CHILD RUNS
+# ============================================================
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_child(mode: str, input_file: Path, output_file: Path):
+    from src.history.b1_extract_load import extract_watch_history as ewh
+
+    start = time.perf_counter()
+
+    if mode == "stream":
+        ewh.extract_watch_history_youtube_music(input_file, output_file)
+    else:
+        # Baseline: the previous extractor (whole array loaded, one dict per
+        # row with every output column, one DataFrame written as CSV)
+        import pandas as pd
+
+        with open(input_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        extraction_date = datetime.utcnow().date().isoformat()
+        rows = [
+            {
+                "track_id": ewh.extract_video_id(e.get("titleUrl")),
+                "title": ewh.clean_title(e.get("title")),
+                "artist": ewh.clean_artist(ewh.extract_artist(e)),
+                "album": None,
+                "duration_seconds": None,
+                "liked": None,
+                "ytm_url": e.get("titleUrl"),
+                "source": "watch_history",
+                "played_at": e.get("time"),
+                "extraction_date": extraction_date,
+            }
+            for e in data
+            if e.get("header") == "YouTube Music"
+        ]
+        pd.DataFrame(rows).to_csv(output_file, index=False)
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": _peak_rss_mb()}))
+
+
+def run_case(mode: str, input_file: Path) -> dict:
+    output_file = input_file.with_suffix(f".{mode}.out")
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_extract_watch_history",
+         "--child", mode, str(input_file), str(output_file)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--skip-baseline", action="store_true",
+                        help="Do not run the json.load baseline (it needs RAM ~ several x file size).")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "INPUT", "OUTPUT"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, input_file, output_file = args.child
+        _run_child(mode, Path(input_file), Path(output_file))
+        return
+
+    modes = ["stream"] if args.skip_baseline else ["stream", "json_load"]
+
+    print(f"{'events':>12} {'file MB':>9} {'mode':>10} {'seconds':>9} {'peak RSS MB':>12}")
+    for n_events in args.events:
+        input_file = BENCH_DIR / f"watch-history-{n_events}.json"
+        if not input_file.exists():
+            print(f"🛠 Generating {input_file.name}...")
+            generate_watch_history(input_file, n_events)
+
+        size_mb = input_file.stat().st_size / 1024 / 1024
+        for mode in modes:
+            result = run_case(mode, input_file)
+            print(
+                f"{n_events:>12,} {size_mb:>9.0f} {mode:>10} "
+                f"{result['seconds']:>9.2f} {result['peak_rss_mb']:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
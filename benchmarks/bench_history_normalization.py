@@ -0,0 +1,165 @@
+"""
+Benchmark — per-row vs columnar watch-history normalization.
+
+Builds synthetic YouTube Music events (including the awkward cases: URL
+fragments, blank/percent-encoded `v=`, missing fields, ' - Topic' variants),
+checks that the columnar transform returns exactly what the per-row helpers
+return, then compares their throughput.
+
+Usage (from the project root):
+    python -m benchmarks.bench_history_normalization --events 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import pandas as pd
+
+from src.common.fingerprint import listening_id
+from src.common.state import parse_played_at
+from src.history.b1_extract_load.extract_watch_history import (
+    OUTPUT_COLUMNS,
+    clean_artist,
+    clean_title,
+    extract_artist,
+    extract_video_id,
+    normalize_events,
+)
+
+EXTRACTION_DATE = "2025-01-01"
+
+EDGE_URLS = [
+    None,
+    "",
+    "https://music.youtube.com/watch?v=abc123",
+    "https://music.youtube.com/watch?v=abc123&list=RDAMVM",
+    "https://music.youtube.com/watch?list=RD&v=abc123",
+    "https://music.youtube.com/watch?v=&v=second",
+    "https://music.youtube.com/watch?v=",
+    "https://music.youtube.com/watch?vv=nope",
+    "https://music.youtube.com/watch?v=frag#v=ignored",
+    "https://music.youtube.com/watch#x?v=not-a-query",
+    "https://music.youtube.com/watch?v=a%2Db+c",
+    "https://music.youtube.com/watch?%76=encoded-key",
+    "https://music.youtube.com/watch?v=a=b",
+    "https://music.youtube.com/watch?v=tab\tbed",
+    "https://music.youtube.com/channel/UC000",
+]
+EDGE_TITLES = [None, "", "Watched ", "Watched Girl!", "Watched Watched Twice",
+               "watched lower", " Watched leading space", "Plain title"]
+EDGE_ARTISTS = [None, "", "Daft Punk - Topic", "Daft Punk -Topic  ", "  Daft Punk  ",
+                "Topic", "- Topic", "Artist - Topic - Topic", "Tropical - Topics"]
+
+
+# ============================================================
+# SYNTHETIC EVENTS
+# ============================================================
+
+def make_events(n_events: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    events = []
+
+    for i in range(n_events):
+        if i % 50 == 0:
+            url = rng.choice(EDGE_URLS)
+            title = rng.choice(EDGE_TITLES)
+            artist = rng.choice(EDGE_ARTISTS)
+        else:
+            video_id = f"vid{rng.randrange(50_000):08d}"
+            url = f"https://music.youtube.com/watch?v={video_id}"
+            title = f"Watched Song {video_id}"
+            artist = f"Artist {rng.randrange(5_000)} - Topic"
+
+        event = {"header": "YouTube Music", "title": title, "titleUrl": url,
+                 "time": f"2024-05-{i % 28 + 1:02d}T10:00:00.000Z"}
+        if artist is not None:
+            event["subtitles"] = [{"name": artist}]
+        events.append(event)
+
+    return events
+
+
+# ============================================================
+# BOTH PATHS
+# ============================================================
+
+def per_row(events: list[dict]) -> list[dict]:
+    """The historical per-event path."""
+    return [
+        {
+            "listening_id": listening_id(
+                extract_video_id(event.get("titleUrl")),
+                parse_played_at(event["time"]) if event.get("time") else None,
+            ),
+            "track_id": extract_video_id(event.get("titleUrl")),
+            "title": clean_title(event.get("title")),
+            "artist": clean_artist(extract_artist(event)),
+            "album": None,
+            "duration_seconds": None,
+            "liked": None,
+            "ytm_url": event.get("titleUrl"),
+            "source": "watch_history",
+            "played_at": event.get("time"),
+            "extraction_date": EXTRACTION_DATE,
+        }
+        for event in events
+    ]
+
+
+def columnar(events: list[dict]):
+    raw = {
+        "title": [e.get("title") for e in events],
+        "titleUrl": [e.get("titleUrl") for e in events],
+        "artist": [extract_artist(e) for e in events],
+        "time": [e.get("time") for e in events],
+    }
+    start = time.perf_counter()
+    df = normalize_events(raw, EXTRACTION_DATE)
+    return df, time.perf_counter() - start
+
+
+def check_parity(expected: list[dict], df) -> int:
+    mismatches = 0
+    for column in OUTPUT_COLUMNS:
+        got = [None if value is pd.NA else value for value in df[column].tolist()]
+        want = [row[column] for row in expected]
+        for i, (g, w) in enumerate(zip(got, want)):
+            if g != w or type(g) is not type(w):
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"❌ {column}[{i}]: columnar={g!r} per-row={w!r}")
+    return mismatches
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+
+    start = time.perf_counter()
+    expected = per_row(events)
+    row_seconds = time.perf_counter() - start
+
+    df, col_seconds = columnar(events)
+
+    mismatches = check_parity(expected, df)
+    if mismatches:
+        print(f"❌ Parity check failed: {mismatches} mismatching cells")
+        sys.exit(1)
+    print(f"✅ Parity check passed on {len(events):,} events")
+
+    print(f"per-row : {row_seconds:8.2f}s  {len(events) / row_seconds:>12,.0f} events/s")
+    print(f"columnar: {col_seconds:8.2f}s  {len(events) / col_seconds:>12,.0f} events/s")
+    print(f"speedup : {row_seconds / col_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
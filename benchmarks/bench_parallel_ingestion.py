@@ -0,0 +1,99 @@
+"""
+Benchmark — Takeout ingestion scaling over 1..N worker processes.
+
+Generates a synthetic Takeout (watch-history.json files from several exports,
+a library CSV and playlist CSVs), then runs both extractors with a growing
+number of workers:
+- extract_watch_history: byte ranges of the JSON files, one part file each
+- extract_library_takeout: groups of playlist CSVs, one part file each
+
+Checks that every parallel output is identical to the serial one (same rows,
+same order), then reports wall time and speedup per worker count.
+
+Usage (from the project root):
+    python -m benchmarks.bench_parallel_ingestion --events 2000000 --files 4 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from benchmarks.bench_extract_watch_history import generate_watch_history
+from benchmarks.bench_playlist_extraction import write_takeout
+from src.history.b1_extract_load.extract_watch_history import extract_watch_history_youtube_music
+from src.library.a1_extract_load.extract_library_takeout import extract_library_and_playlists
+
+
+def timed(function, **kwargs) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):     # no per-run / per-playlist progress lines
+        function(**kwargs)
+    return time.perf_counter() - start
+
+
+def default_workers() -> list[int]:
+    cores = os.cpu_count() or 1
+    return sorted({1, *[2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores], cores})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2_000_000, help="Watch-history events, all files together.")
+    parser.add_argument("--files", type=int, default=4, help="watch-history.json files (Takeout exports).")
+    parser.add_argument("--songs", type=int, default=50_000)
+    parser.add_argument("--playlists", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        print(f"🛠 Generating {args.events:,} events in {args.files} files, "
+              f"{args.songs:,} songs and {args.playlists} playlists...")
+        history_files = [tmp / f"watch-history-{i}.json" for i in range(args.files)]
+        for i, path in enumerate(history_files):
+            generate_watch_history(path, args.events // args.files, seed=i)
+
+        library, allowed = write_takeout(tmp, args.songs, args.playlists)
+        library_file = tmp / "music library songs.csv"
+        library.to_csv(library_file, index=False)
+
+        cases = {
+            "watch_history": lambda workers, output: timed(
+                extract_watch_history_youtube_music,
+                input_files=history_files, output_file=output, workers=workers,
+            ),
+            "library": lambda workers, output: timed(
+                extract_library_and_playlists,
+                library_file=library_file, playlists=tmp / "playlists",
+                output_file=output, allowed=allowed, workers=workers,
+            ),
+        }
+
+        print(f"{'extractor':>14} {'workers':>8} {'rows':>11} {'seconds':>8} {'speedup':>8}")
+        for name, run in cases.items():
+            serial = None
+            for workers in args.workers:
+                output = tmp / f"{name}-{workers}.parquet"
+                seconds = run(workers, output)
+                table = pq.read_table(output)
+
+                if serial is None:
+                    serial, serial_s = table, seconds
+                elif not table.equals(serial):
+                    sys.exit(f"❌ {name}: output with {workers} workers differs from the serial run")
+
+                print(f"{name:>14} {workers:>8} {table.num_rows:>11,} {seconds:>8.2f} {serial_s / seconds:>7.1f}x")
+
+    print(f"✅ Same output for every worker count ({os.cpu_count()} cores)")
+
+
+if __name__ == "__main__":
+    main()
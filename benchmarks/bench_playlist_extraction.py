@@ -0,0 +1,139 @@
+"""
+Benchmark — per-playlist merges vs one indexed lookup (library extraction).
+
+Writes a synthetic Takeout library (one CSV of songs) and playlist CSVs to a
+temporary directory, then extracts the allowlisted playlists both ways:
+- the previous approach: every playlist CSV read in turn, merged with the
+  whole raw library, URLs built with `.apply`
+- `extract_playlists()`: the CSVs read in parallel and concatenated, the
+  library indexed once by Video ID, one join, vectorized URLs
+
+Checks that both return the same rows, then reports their wall time for a
+growing number of playlists.
+
+Usage (from the project root):
+    python -m benchmarks.bench_playlist_extraction --songs 50000 --playlists 50 200 500
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.library.a1_extract_load.extract_library_takeout import extract_playlists
+
+
+# ============================================================
+# SYNTHETIC TAKEOUT
+# ============================================================
+
+def write_takeout(directory: Path, n_songs: int, n_playlists: int, seed: int = 3) -> tuple[pd.DataFrame, list]:
+    rng = random.Random(seed)
+
+    library = pd.DataFrame({
+        "Video ID": [f"vid{i:08d}" for i in range(n_songs)],
+        "Song Title": [f"Song {i}" for i in range(n_songs)],
+        "Album Title": [f"Album {i // 12}" for i in range(n_songs)],
+        "Artist Name 1": [f"Artist {i % 3_000}" for i in range(n_songs)],
+    })
+
+    playlists_dir = directory / "playlists"
+    playlists_dir.mkdir()
+    allowed = []
+    for p in range(n_playlists):
+        name = f"Playlist {p:04d}"
+        # A few videos per playlist are not in the library (no metadata)
+        video_ids = [
+            f"vid{rng.randrange(n_songs):08d}" if rng.random() < 0.98 else f"gone{rng.randrange(10**6):06d}"
+            for _ in range(rng.randint(20, 400))
+        ]
+        pd.DataFrame({"Video ID": video_ids}).to_csv(playlists_dir / f"{name}-videos.csv", index=False)
+        if p % 10:
+            allowed.append(name)    # one playlist in ten is not allowlisted
+
+    return library, allowed
+
+
+# ============================================================
+# BOTH PATHS
+# ============================================================
+
+def per_playlist(df_raw_library, allowed, playlists_dir: Path) -> pd.DataFrame:
+    """The previous extraction: one merge with the whole library per playlist."""
+    rows = []
+    for playlist_file in sorted(playlists_dir.glob("*.csv")):
+        playlist_name = playlist_file.stem.replace("-videos", "").strip()
+        if playlist_name not in allowed:
+            continue
+
+        merged = pd.read_csv(playlist_file).merge(df_raw_library, on="Video ID", how="left")
+        merged["ytm_url"] = merged["Video ID"].apply(lambda x: f"https://music.youtube.com/watch?v={x}")
+
+        rows.append(pd.DataFrame({
+            "track_id": merged["Video ID"],
+            "title": merged["Song Title"],
+            "artist": merged["Artist Name 1"],
+            "album": merged["Album Title"],
+            "duration_seconds": None,
+            "liked": None,
+            "ytm_url": merged["ytm_url"],
+            "source": f"playlist:{playlist_name}",
+            "extraction_date": datetime.utcnow().date().isoformat(),
+        }))
+
+    return pd.concat(rows, ignore_index=True)
+
+
+def timed(function, *args) -> tuple[pd.DataFrame, float]:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):     # no per-playlist progress lines
+        df = function(*args)
+    return df, time.perf_counter() - start
+
+
+def same_rows(expected: pd.DataFrame, got: pd.DataFrame) -> bool:
+    if len(expected) != len(got):
+        return False
+    return all(
+        [None if pd.isna(v) else v for v in expected[column]] == [None if pd.isna(v) else v for v in got[column]]
+        for column in expected.columns
+    )
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--songs", type=int, default=50_000)
+    parser.add_argument("--playlists", type=int, nargs="+", default=[50, 200, 500])
+    args = parser.parse_args()
+
+    print(f"{'playlists':>10} {'rows':>9} {'per-playlist s':>15} {'indexed s':>10} {'speedup':>8}")
+    for n_playlists in args.playlists:
+        with tempfile.TemporaryDirectory() as tmp:
+            library, allowed = write_takeout(Path(tmp), args.songs, n_playlists)
+            playlists_dir = Path(tmp) / "playlists"
+
+            baseline, baseline_s = timed(per_playlist, library, allowed, playlists_dir)
+            indexed, indexed_s = timed(extract_playlists, library, allowed, playlists_dir)
+
+        if not same_rows(baseline, indexed):
+            sys.exit(f"❌ Different rows for {n_playlists} playlists")
+
+        print(f"{n_playlists:>10} {len(indexed):>9,} {baseline_s:>15.2f} {indexed_s:>10.2f} "
+              f"{baseline_s / indexed_s:>7.1f}x")
+
+    print("✅ Same rows both ways")
+
+
+if __name__ == "__main__":
+    main()
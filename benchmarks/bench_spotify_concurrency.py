@@ -0,0 +1,88 @@
+"""
+Benchmark — concurrent Spotify enrichment against a local mock server.
+
+Runs the two enrichment phases (track search, then artist genres) at
+several concurrency levels against benchmarks/mock_spotify.py, which
+injects latency and random 429s. Checks that every level returns exactly
+the sequential result, in the same order, and reports the speedup.
+
+Usage (from the project root):
+    python -m benchmarks.bench_spotify_concurrency --tracks 300 --latency 0.05 --rate-429 0.01
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.mock_spotify import MockSpotify
+from src.enrichment import concurrent
+from src.enrichment.concurrent import fetch_artist_genres, search_tracks
+from src.enrichment.rate_limit import RateLimiter
+from src.enrichment.client import SpotifyClient
+
+
+def make_keys(n_tracks: int) -> list[tuple]:
+    return [(f"Song {i}", f"Artist {i % (n_tracks // 4 + 1)}") for i in range(n_tracks)]
+
+
+def run_level(base_url: str, credentials: Path, keys: list, workers: int, max_rps: float):
+    client = SpotifyClient(
+        rate_limiter=RateLimiter(max_rps),
+        credentials_file=credentials,
+        api_url=f"{base_url}/v1",
+        token_url=f"{base_url}/api/token",
+    )
+
+    start = time.perf_counter()
+    items = search_tracks(client, keys, workers)
+    artist_ids = [item["artists"][0]["id"] for item in items if item]
+    genres = fetch_artist_genres(client, artist_ids, workers)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, (items, list(genres.items())), client.rate_limiter.pauses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tracks", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response.")
+    parser.add_argument("--rate-429", type=float, default=0.01, help="Share of responses that are 429.")
+    parser.add_argument("--max-rps", type=float, default=1000, help="Client-side rate limit.")
+    args = parser.parse_args()
+
+    keys = make_keys(args.tracks)
+    concurrent.LOG_EVERY = float("inf")  # keep the table readable
+
+    with tempfile.TemporaryDirectory() as tmp:
+        credentials = Path(tmp) / "spotify_credentials.json"
+        credentials.write_text(json.dumps({"client_id": "bench", "client_secret": "bench"}))
+
+        baseline_seconds = baseline_output = None
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'requests':>9} {'429s':>6} {'pauses':>7}")
+
+        for workers in args.workers:
+            mock = MockSpotify(latency=args.latency, rate_429=args.rate_429)
+            base_url = mock.start()
+            try:
+                seconds, output, pauses = run_level(base_url, credentials, keys, workers, args.max_rps)
+            finally:
+                mock.stop()
+
+            if baseline_output is None:
+                baseline_seconds, baseline_output = seconds, output
+            elif output != baseline_output:
+                raise SystemExit(f"❌ Output at {workers} workers differs from the sequential run")
+
+            print(
+                f"{workers:>8} {seconds:>9.2f} {baseline_seconds / seconds:>7.1f}x "
+                f"{mock.requests:>9} {mock.throttled:>6} {pauses:>7}"
+            )
+
+    print("✅ Output identical and in input order at every concurrency level")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark — per-request latency of the Spotify client transport.
+
+Sends the same search requests to benchmarks/mock_spotify.py (no injected
+latency, HTTP/1.1 keep-alive) through:
+- the previous transport: module-level requests.get(), a new TCP
+  connection per call
+- SpotifyClient's pooled session, which reuses its connections
+
+and reports p50 / p95 / mean latency per request, sequentially and with
+concurrent workers. Against the real API every new connection also pays a
+TLS handshake, so the gap measured here on plain local HTTP is a floor.
+
+Usage (from the project root):
+    python -m benchmarks.bench_spotify_transport --requests 2000 --workers 8
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from benchmarks.mock_spotify import MockSpotify
+from src.enrichment.client import SpotifyClient
+
+
+def _timed(func, arg) -> float:
+    start = time.perf_counter()
+    func(arg)
+    return time.perf_counter() - start
+
+
+def run(send, n_requests: int, workers: int) -> list[float]:
+    queries = [f"track:Song {i} artist:Artist {i % 50}" for i in range(n_requests)]
+    if workers <= 1:
+        return [_timed(send, query) for query in queries]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda query: _timed(send, query), queries))
+
+
+def summarize(latencies: list[float]) -> tuple[float, float, float]:
+    ms = sorted(latency * 1000 for latency in latencies)
+    return ms[len(ms) // 2], ms[int(len(ms) * 0.95)], statistics.fmean(ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    mock = MockSpotify(latency=0)
+    base_url = mock.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        credentials = Path(tmp) / "spotify_credentials.json"
+        credentials.write_text(json.dumps({"client_id": "bench", "client_secret": "bench"}))
+
+        print(f"{'transport':>18} {'workers':>8} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+
+        try:
+            for workers in args.workers:
+                client = SpotifyClient(
+                    credentials_file=credentials,
+                    api_url=f"{base_url}/v1",
+                    token_url=f"{base_url}/api/token",
+                    pool_size=max(1, workers),
+                )
+                url = f"{client.api_url}/search"
+                token = client._current_token()
+
+                def unpooled(query):
+                    headers = {"Authorization": f"Bearer {token}"}
+                    requests.get(url, headers=headers, params={"q": query, "type": "track", "limit": 5})
+
+                def pooled(query):
+                    client._request(url, {"q": query, "type": "track", "limit": 5})
+
+                for name, send in [("requests.get", unpooled), ("pooled session", pooled)]:
+                    p50, p95, mean = summarize(run(send, args.requests, workers))
+                    print(f"{name:>18} {workers:>8} {p50:>8.3f} {p95:>8.3f} {mean:>8.3f}")
+
+                client.close()
+        finally:
+            mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark — offline warehouse load throughput (DuckDB sink).
+
+Loads a synthetic watch history into a throwaway DuckDB file through the
+same sink the loaders use (YT_WAREHOUSE=duckdb), then replays an
+incremental MERGE with a share of new plays, and reports rows/s for each.
+
+Usage (from the project root):
+    python -m benchmarks.bench_warehouse_load --rows 1000000 --new-share 0.05
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.history.b1_extract_load.extract_watch_history import listening_ids
+from src.warehouse.datasets import RAW_WATCH_HISTORY
+from src.warehouse.sinks import DuckDBSink
+
+
+def make_history(n_rows: int, start: str = "2020-01-01", seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    video_ids = pd.Series([f"v{i:06d}" for i in rng.integers(0, max(1, n_rows // 50), n_rows)])
+    played_at = pd.Timestamp(start, tz="UTC") + pd.to_timedelta(np.arange(n_rows) * 180, unit="s")
+
+    return pd.DataFrame({
+        "listening_id": listening_ids(video_ids, pd.Series(played_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ"))),
+        "track_id": video_ids,
+        "title": "Song " + video_ids,
+        "artist": "Artist " + (video_ids.str[-2:]),
+        "album": None,
+        "duration_seconds": None,
+        "liked": None,
+        "ytm_url": "https://music.youtube.com/watch?v=" + video_ids,
+        "source": "watch_history",
+        "played_at": played_at,
+        "extraction_date": "2025-01-01",
+    })
+
+
+def timed_load(sink, df, incremental: bool) -> tuple[float, int]:
+    stats = sink.load(RAW_WATCH_HISTORY, df, incremental=incremental)
+    return stats.seconds, stats.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--new-share", type=float, default=0.05,
+                        help="Share of new plays in the incremental export.")
+    args = parser.parse_args()
+
+    history = make_history(args.rows)
+    n_new = int(args.rows * args.new_share)
+    newer = make_history(n_new, start=str(history["played_at"].max() + pd.Timedelta(hours=1)), seed=1)
+    export = pd.concat([history, newer], ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = DuckDBSink(Path(tmp) / "bench.duckdb")
+
+        print(f"{'load':>22} {'rows in':>10} {'written':>10} {'seconds':>8} {'rows/s':>12}")
+        for label, df, incremental in [
+            ("full (replace)", history, False),
+            ("incremental (merge)", export, True),
+            ("replay (merge, no-op)", export, True),
+        ]:
+            seconds, written = timed_load(sink, df, incremental)
+            print(f"{label:>22} {len(df):>10} {written:>10} {seconds:>8.2f} {len(df) / seconds:>12,.0f}")
+
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Local mock of the Spotify Web API endpoints used by the enrichers.
+
+Answers deterministically (same query -> same track/artist IDs), returns a
+decoy candidate ahead of the real track on searches, can inject
+latency and random 429 responses with a Retry-After header, and speaks
+HTTP/1.1 so keep-alive connections can be reused. Used by the benchmarks.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+GENRES = ["house", "french house", "electro", "nu disco", "hip hop", "jazz", "indie pop"]
+
+
+def _id(prefix: str, value: str) -> str:
+    return prefix + hashlib.sha1(value.encode("utf-8")).hexdigest()[:20]
+
+
+def _parse_query(query: str) -> tuple[str, str]:
+    """'track:Girl! artist:Daft Punk' -> ('Girl!', 'Daft Punk')."""
+    title, _, artist = query.partition(" artist:")
+    return title.removeprefix("track:").strip(), artist.strip()
+
+
+def _track(query: str, artist: str | None = None) -> dict:
+    title, query_artist = _parse_query(query)
+    artist = artist or query_artist or "Unknown Artist"
+    return {
+        "id": _id("t", query),
+        "name": title,
+        "duration_ms": 120_000 + int(_id("", query)[:4], 16) % 180_000,
+        "popularity": int(_id("", query)[4:6], 16) % 101,
+        "explicit": False,
+        "album": {"id": _id("al", query), "name": "Album", "release_date": "2001-03-12"},
+        "artists": [{"id": _id("ar", artist), "name": artist}],
+    }
+
+
+def _search_items(query: str) -> list[dict]:
+    """A karaoke cover ranked first, then the real track (exercises re-ranking)."""
+    title, _ = _parse_query(query)
+    decoy = _track(f"track:{title} (Karaoke Version)", artist="Sing King")
+    return [decoy, _track(query)]
+
+
+def _artist(artist_id: str) -> dict:
+    n = int(hashlib.sha1(artist_id.encode()).hexdigest()[:2], 16)
+    return {"id": artist_id, "genres": GENRES[n % len(GENRES): n % len(GENRES) + 2]}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default (5) drops connections under load
+
+
+class MockSpotify:
+
+    def __init__(self, latency: float = 0.05, rate_429: float = 0.0, retry_after: int = 1, seed: int = 0):
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    # ---------------- SERVER ---------------- #
+    def start(self) -> str:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes: without TCP_NODELAY a
+            # kept-alive connection stalls on Nagle + delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: dict, headers: dict | None = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                self._send(200, {"access_token": "mock-token", "expires_in": 3600})
+
+            def do_GET(self):
+                status, payload, headers = mock.handle(self.path)
+                self._send(status, payload, headers)
+
+        self._server = _Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ---------------- ROUTES ---------------- #
+    def handle(self, path: str):
+        with self._lock:
+            self.requests += 1
+            throttle = self._rng.random() < self.rate_429
+            if throttle:
+                self.throttled += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            return 429, {"error": "rate limited"}, {"Retry-After": str(self.retry_after)}
+
+        url = urlparse(path)
+        params = parse_qs(url.query)
+
+        if url.path == "/v1/search":
+            query = params["q"][0]
+            items = [] if "nomatch" in query.lower() else _search_items(query)
+            return 200, {"tracks": {"items": items}}, {}
+
+        if url.path == "/v1/artists":
+            ids = params["ids"][0].split(",")
+            return 200, {"artists": [_artist(artist_id) for artist_id in ids]}, {}
+
+        if url.path.startswith("/v1/artists/"):
+            return 200, _artist(url.path.rsplit("/", 1)[1]), {}
+
+        if url.path == "/v1/tracks":
+            ids = params["ids"][0].split(",")
+            return 200, {"tracks": [dict(_track(track_id), id=track_id) for track_id in ids]}, {}
+
+        return 404, {"error": "not found"}, {}
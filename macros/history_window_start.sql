@@ -0,0 +1,25 @@
+{#
+    Start of the window an incremental history model reprocesses.
+
+    On an incremental run, returns a constant TIMESTAMP literal: midnight UTC,
+    `history_lookback_days` days before the latest `column` already in the
+    model. Being a constant (looked up once at compile time, not a subquery),
+    it lets BigQuery prune the partitions of the upstream tables, and starting
+    on a day boundary keeps per-day window functions complete. Late plays
+    inside the lookback are picked up and merged on the unique key.
+#}
+{% macro history_window_start(column='played_at', lookback_days=var('history_lookback_days')) %}
+
+    {%- if not (execute and is_incremental()) -%}
+        {{ return("timestamp('1970-01-01')") }}
+    {%- endif -%}
+
+    {%- set latest = run_query("select max(" ~ column ~ ") from " ~ this).columns[0].values()[0] -%}
+
+    {%- if latest is none -%}
+        {{ return("timestamp('1970-01-01')") }}
+    {%- endif -%}
+
+    {{ return("timestamp_sub(timestamp(date(timestamp('" ~ latest ~ "'))), interval " ~ lookback_days ~ " day)") }}
+
+{% endmacro %}
@@ -0,0 +1,35 @@
+{#
+    on-run-end hook: logs the BigQuery bytes processed and billed by every
+    model of the run, and the run total, from the adapter responses.
+#}
+{% macro log_bytes_scanned(results) %}
+
+    {%- if execute -%}
+        {%- set ns = namespace(processed=0, billed=0) -%}
+
+        {%- for result in results if result.node.resource_type == 'model' -%}
+            {%- set response = result.adapter_response or {} -%}
+            {%- set processed = response.get('bytes_processed') or 0 -%}
+            {%- set billed = response.get('bytes_billed') or 0 -%}
+            {%- set ns.processed = ns.processed + processed -%}
+            {%- set ns.billed = ns.billed + billed -%}
+
+            {{ log(
+                "bytes scanned | " ~ result.node.name
+                ~ " | " ~ result.status
+                ~ " | processed " ~ (processed / 1e6) | round(1) ~ " MB"
+                ~ " | billed " ~ (billed / 1e6) | round(1) ~ " MB",
+                info=True
+            ) }}
+        {%- endfor -%}
+
+        {{ log(
+            "bytes scanned | run total | processed " ~ (ns.processed / 1e6) | round(1) ~ " MB"
+            ~ " | billed " ~ (ns.billed / 1e6) | round(1) ~ " MB",
+            info=True
+        ) }}
+    {%- endif -%}
+
+    {{ return('') }}
+
+{% endmacro %}
@@ -1,12 +1,27 @@
 -- models/intermediate/int_kpi_core_history.sql
 
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='merge',
+        unique_key='listening_id',
+        partition_by={'field': 'listen_date', 'data_type': 'date', 'granularity': 'day'},
+        cluster_by=['spotify_track_id'],
+        on_schema_change='append_new_columns'
+    )
+}}
+
+-- Incremental: whole days from the window start are recomputed, so the
+-- per-day listen_count window below always sees complete days
+{% set window_start = history_window_start('played_at_ts') %}
+
 with core as (
 
     select
         listening_id,  -- keep PK for traceability
 
-        -- cast STRING → TIMESTAMP and filter nulls
-        timestamp(played_at) as played_at_ts
+        -- played_at is loaded as TIMESTAMP (cast kept for safety)
+        cast(played_at as timestamp) as played_at_ts
 
         , artist
         , title
@@ -17,6 +32,9 @@ with core as (
 
     from {{ ref('int_merged_history') }}
     where played_at is not null  -- filter nulls here
+    {% if is_incremental() %}
+      and played_at >= {{ window_start }}
+    {% endif %}
 
 )
 
@@ -36,6 +54,8 @@ select
     artist,
     title,
     spotify_track_id,
+    main_genre,
+    sub_genre,
 
     -- metrics
     duration_seconds,
@@ -1,29 +1,76 @@
 -- models/intermediate/int_kpi_history.sql
+-- Each event is one listen: counted once with count(*). Summing the per-day
+-- window listen_count over events counted a track played n times n^2 times,
+-- and ranking events by it did not give the busiest hour.
+-- Dashboards read the same KPIs from the rollup marts (mart_kpi_history_*).
+
+with events as (
+
+    select
+        listen_date,
+        listen_hour,
+        spotify_track_id,
+        duration_minutes,
+        duration_hours
+    from {{ ref('int_kpi_core_history') }}
+
+),
+
+peak_hour as (
+
+    -- busiest hour of each day (earliest one on ties)
+    select
+        listen_date,
+        array_agg(listen_hour order by listens desc, listen_hour limit 1)[offset(0)] as peak_listening_hour
+    from (
+        select listen_date, listen_hour, count(*) as listens
+        from events
+        group by listen_date, listen_hour
+    )
+    group by listen_date
+
+),
+
+daily as (
+
+    select
+        listen_date,
+
+        -- core volume KPIs
+        count(*)                                        as total_listens,
+        count(distinct spotify_track_id)                as unique_tracks,
+
+        -- time KPIs
+        sum(duration_minutes)                           as total_minutes,
+        sum(duration_hours)                             as total_hours
+
+    from events
+    group by listen_date
+
+)
 
 select
-    listen_date,
+    d.listen_date,
 
     -- core volume KPIs
-    sum(listen_count)                               as total_listens,
-    count(distinct spotify_track_id)                as unique_tracks,
+    d.total_listens,
+    d.unique_tracks,
 
     -- time KPIs
-    sum(duration_minutes)                           as total_minutes,
-    sum(duration_hours)                             as total_hours,
+    d.total_minutes,
+    d.total_hours,
 
     -- averages
-    safe_divide(
-        sum(listen_count),
-        count(distinct spotify_track_id)
-    )                                               as avg_listens_per_track,
+    safe_divide(d.total_listens, d.unique_tracks)       as avg_listens_per_track,
 
     -- peak listening hour per day
-    array_agg(listen_hour order by listen_count desc limit 1)[offset(0)] as peak_listening_hour,
+    p.peak_listening_hour,
 
     -- seasonality
-    extract(month from listen_date)                 as listen_month,
-    extract(dayofweek from listen_date)            as listen_weekday
+    extract(month from d.listen_date)                   as listen_month,
+    extract(dayofweek from d.listen_date)               as listen_weekday
 
-from {{ ref('int_kpi_core_history') }}
-group by listen_date
-order by listen_date
+from daily d
+left join peak_hour p
+    on p.listen_date = d.listen_date
+order by d.listen_date
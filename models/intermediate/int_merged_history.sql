@@ -1,3 +1,18 @@
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='merge',
+        unique_key='listening_id',
+        partition_by={'field': 'played_at', 'data_type': 'timestamp', 'granularity': 'day'},
+        cluster_by=['spotify_track_id'],
+        on_schema_change='append_new_columns'
+    )
+}}
+
+-- Incremental: only the days since the latest play already merged
+-- (minus the lookback) are read from the day-partitioned raw tables
+{% set window_start = history_window_start('played_at') %}
+
 with spotify as (
 
     select
@@ -16,6 +31,9 @@ with spotify as (
         genres,
         extraction_date
     from {{ ref('stg_raw__spotify_history') }}
+    {% if is_incremental() %}
+    where source_played_at >= {{ window_start }}
+    {% endif %}
 
 ),
 
@@ -26,6 +44,9 @@ yt as (
         played_at,
         ytm_url
     from {{ ref('stg_raw__yt_history') }}
+    {% if is_incremental() %}
+    where played_at >= {{ window_start }}
+    {% endif %}
 
 ),
 
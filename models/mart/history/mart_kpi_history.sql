@@ -0,0 +1,75 @@
+-- models/mart/history/mart_kpi_history.sql
+-- Daily listening KPIs (same definitions as int_kpi_history), computed from
+-- the hourly rollup: its size grows with days x tracks played, not with plays.
+
+{{
+    config(
+        partition_by={'field': 'listen_date', 'data_type': 'date', 'granularity': 'month'},
+        cluster_by=['listen_date']
+    )
+}}
+
+with hourly as (
+
+    select
+        listen_date,
+        listen_hour,
+        spotify_track_id,
+        listens,
+        minutes_listened
+    from {{ ref('mart_kpi_history_hourly_track') }}
+
+),
+
+peak_hour as (
+
+    -- busiest hour of each day (earliest one on ties)
+    select
+        listen_date,
+        array_agg(listen_hour order by listens desc, listen_hour limit 1)[offset(0)] as peak_listening_hour
+    from (
+        select listen_date, listen_hour, sum(listens) as listens
+        from hourly
+        group by listen_date, listen_hour
+    )
+    group by listen_date
+
+),
+
+daily as (
+
+    select
+        listen_date,
+        sum(listens)                                as total_listens,
+        count(distinct spotify_track_id)            as unique_tracks,
+        sum(minutes_listened)                       as total_minutes,
+        sum(minutes_listened) / 60.0                as total_hours
+    from hourly
+    group by listen_date
+
+)
+
+select
+    d.listen_date,
+
+    -- core volume KPIs
+    d.total_listens,
+    d.unique_tracks,
+
+    -- time KPIs
+    d.total_minutes,
+    d.total_hours,
+
+    -- averages
+    safe_divide(d.total_listens, d.unique_tracks)   as avg_listens_per_track,
+
+    -- peak listening hour per day
+    p.peak_listening_hour,
+
+    -- seasonality
+    extract(month from d.listen_date)               as listen_month,
+    extract(dayofweek from d.listen_date)           as listen_weekday
+
+from daily d
+left join peak_hour p
+    on p.listen_date = d.listen_date
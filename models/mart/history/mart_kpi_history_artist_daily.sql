@@ -0,0 +1,29 @@
+-- models/mart/history/mart_kpi_history_artist_daily.sql
+-- Artist aggregate: 1 row per day x artist, re-aggregated from the hourly
+-- rollup (never from the plays). Same incremental maintenance as the rollups.
+
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='insert_overwrite',
+        partition_by={'field': 'listen_date', 'data_type': 'date', 'granularity': 'day'},
+        cluster_by=['artist'],
+        on_schema_change='append_new_columns'
+    )
+}}
+
+{% set window_start = history_window_start('listen_date') %}
+
+select
+    listen_date,
+    artist,
+
+    sum(listens)                                    as listens,
+    count(distinct spotify_track_id)                as unique_tracks,
+    sum(minutes_listened)                           as minutes_listened
+
+from {{ ref('mart_kpi_history_hourly_track') }}
+{% if is_incremental() %}
+where listen_date >= date({{ window_start }})
+{% endif %}
+group by listen_date, artist
@@ -0,0 +1,31 @@
+-- models/mart/history/mart_kpi_history_daily_genre.sql
+-- Listening rollup: 1 row per day x genre (unmatched tracks under a null genre).
+-- Same incremental maintenance as mart_kpi_history_hourly_track.
+
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='insert_overwrite',
+        partition_by={'field': 'listen_date', 'data_type': 'date', 'granularity': 'day'},
+        cluster_by=['main_genre', 'sub_genre'],
+        on_schema_change='append_new_columns'
+    )
+}}
+
+{% set window_start = history_window_start('listen_date') %}
+
+select
+    listen_date,
+    main_genre,
+    sub_genre,
+
+    count(*)                            as listens,
+    count(distinct spotify_track_id)    as unique_tracks,
+    count(distinct artist)              as unique_artists,
+    sum(duration_minutes)               as minutes_listened
+
+from {{ ref('int_kpi_core_history') }}
+{% if is_incremental() %}
+where listen_date >= date({{ window_start }})
+{% endif %}
+group by listen_date, main_genre, sub_genre
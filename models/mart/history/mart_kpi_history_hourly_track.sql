@@ -0,0 +1,37 @@
+-- models/mart/history/mart_kpi_history_hourly_track.sql
+-- Listening rollup: 1 row per day x hour x track.
+-- Built once, then only the days in the incremental window are recomputed
+-- and their partitions overwritten (aggregates, so no merge key to match).
+
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='insert_overwrite',
+        partition_by={'field': 'listen_date', 'data_type': 'date', 'granularity': 'day'},
+        cluster_by=['spotify_track_id', 'listen_hour'],
+        on_schema_change='append_new_columns'
+    )
+}}
+
+{% set window_start = history_window_start('listen_date') %}
+
+select
+    listen_date,
+    listen_hour,
+    spotify_track_id,
+
+    -- display attributes (constant per Spotify track)
+    any_value(artist)                   as artist,
+    any_value(title)                    as title,
+    any_value(main_genre)               as main_genre,
+    any_value(sub_genre)                as sub_genre,
+
+    -- additive measures: re-aggregate freely by day, hour, track, artist
+    count(*)                            as listens,
+    sum(duration_minutes)               as minutes_listened
+
+from {{ ref('int_kpi_core_history') }}
+{% if is_incremental() %}
+where listen_date >= date({{ window_start }})
+{% endif %}
+group by listen_date, listen_hour, spotify_track_id
@@ -0,0 +1,47 @@
+-- models/mart/history/mart_kpi_history_listens.sql
+-- Listening fact table: 1 row per play, with its time dimensions, track,
+-- artist and genre. Merged incrementally on listening_id; partitioned by day
+-- so BI filters on a date range only scan those days.
+
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='merge',
+        unique_key='listening_id',
+        partition_by={'field': 'listen_date', 'data_type': 'date', 'granularity': 'day'},
+        cluster_by=['spotify_track_id', 'artist'],
+        on_schema_change='append_new_columns'
+    )
+}}
+
+{% set window_start = history_window_start('played_at_ts') %}
+
+select
+    listening_id,
+    played_at_ts,
+
+    -- time dimensions
+    listen_date,
+    listen_hour,
+    listen_weekday,
+    listen_weekday_name,
+
+    -- identity
+    spotify_track_id,
+    artist,
+    title,
+    main_genre,
+    sub_genre,
+
+    -- metrics
+    duration_seconds,
+    duration_minutes,
+
+    -- quality flags
+    has_genre,
+    spotify_track_id is not null                    as has_spotify_match
+
+from {{ ref('int_kpi_core_history') }}
+{% if is_incremental() %}
+where played_at_ts >= {{ window_start }}
+{% endif %}
@@ -9,7 +9,7 @@ source as (
 renamed as (
 
     select
-        concat(source_track_id, '_', cast(source_played_at as string)) as listening_id,
+        listening_id,  -- INT64, carried over from the watch history
         source_track_id,
         source_played_at,
         title_original,
@@ -25,6 +25,7 @@ renamed as (
         popularity,
         explicit,
         trim(split(genres, ',')[SAFE_OFFSET(0)]) as genres,
+        match_confidence,
         extraction_date
 
     from source
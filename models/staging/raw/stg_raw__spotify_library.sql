@@ -36,6 +36,7 @@ renamed as (
         popularity,
         explicit,
         trim(split(genres, ',')[SAFE_OFFSET(0)]) as genres,
+        match_confidence,
         extraction_date
     from dedup
     where rn = 1   -- on garde une seule ligne par source_track_id
@@ -9,7 +9,7 @@ source as (
 renamed as (
 
     select
-        concat(track_id, '_', cast(played_at as string)) as listening_id,
+        listening_id,  -- INT64, computed at extraction
         track_id,
         title,
         artist,
@@ -0,0 +1,68 @@
+# src/common/fingerprint.py
+"""
+Stable fingerprints of listening events.
+
+- `event_fingerprint()`: what Takeout records for a play (the YouTube Music
+  URL and the raw play timestamp), used by the incremental high-water mark
+- `listening_id()`: the play key carried through every stage and joined on
+  in the warehouse, built from the video ID and the play time normalized to
+  UTC microseconds, so it does not depend on how a timestamp is formatted
+
+The fingerprint is computed per event by the streaming parser (incremental
+runs only) and is what saved marks hold; the listening_id is computed per
+chunk, column-wise: a BLAKE2b digest of each distinct video ID, mixed with
+the play time by integer arithmetic (splitmix64) over whole arrays.
+
+Both are 64-bit values returned as signed integers so they fit a BigQuery
+INT64.
+"""
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
+
+import numpy as np
+
+_SEPARATOR = "\x1f"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MASK = (1 << 64) - 1
+
+
+def _digest(*parts: str) -> int:
+    key = _SEPARATOR.join(parts).encode("utf-8")
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), "big", signed=True)
+
+
+def _mix64(x):
+    """splitmix64 finalizer, a bijection of 64-bit values (an int or a uint64 array)."""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def event_fingerprint(ytm_url: str | None, played_at: str | None) -> int:
+    """Signed 64-bit fingerprint of a (ytm_url, played_at) pair."""
+    return _digest(ytm_url or "", played_at or "")
+
+
+def video_digest(video_id: str | None) -> int:
+    """Unsigned 64-bit digest of a video ID (None hashes like "")."""
+    return _digest(video_id or "") & _MASK
+
+
+def listening_id_at(video_id: str | None, played_at_us: int) -> int:
+    """listening_id() from the play time in microseconds since the epoch (UTC)."""
+    key = _mix64(video_digest(video_id) ^ _mix64(played_at_us & _MASK))
+    return key - (1 << 64) if key >> 63 else key
+
+
+def listening_ids_at(video_digests: np.ndarray, played_at_us: np.ndarray) -> np.ndarray:
+    """listening_id_at() over arrays: uint64 video_digest() values and int64 microseconds."""
+    with np.errstate(over="ignore"):
+        keys = _mix64(video_digests ^ _mix64(played_at_us.view(np.uint64)))
+    return keys.view(np.int64)
+
+
+def listening_id(video_id: str | None, played_at: datetime | None) -> int | None:
+    """Signed 64-bit key of a play: video ID + aware play time (None without a time)."""
+    if played_at is None:
+        return None
+    return listening_id_at(video_id, (played_at - _EPOCH) // timedelta(microseconds=1))
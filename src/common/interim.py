@@ -0,0 +1,241 @@
+# src/common/interim.py
+"""
+Interim datasets shared between pipeline stages.
+
+Every stage hands its output to the next one as a typed Parquet file with
+an explicit Arrow schema (timestamps, dates, booleans and integers survive
+the round trip), and every reader only pulls the columns it needs.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config.paths import (
+    INTERIM_LIBRARY,
+    INTERIM_SPOTIFY_HISTORY,
+    INTERIM_SPOTIFY_LIBRARY,
+    INTERIM_WATCH_HISTORY,
+)
+
+
+@dataclass(frozen=True)
+class InterimDataset:
+    name: str
+    path: Path
+    schema: pa.Schema
+
+    @property
+    def columns(self) -> list[str]:
+        return self.schema.names
+
+
+# ============================================================
+# DATASETS
+# ============================================================
+
+WATCH_HISTORY = InterimDataset(
+    name="watch_history_youtube_music",
+    path=INTERIM_WATCH_HISTORY,
+    schema=pa.schema([
+        ("listening_id", pa.int64()),       # play key, see src/common/fingerprint.py
+        ("track_id", pa.string()),
+        ("title", pa.string()),
+        ("artist", pa.string()),
+        ("album", pa.string()),
+        ("duration_seconds", pa.float64()),
+        ("liked", pa.bool_()),
+        ("ytm_url", pa.string()),
+        ("source", pa.string()),
+        ("played_at", pa.timestamp("us", tz="UTC")),
+        ("extraction_date", pa.date32()),
+    ]),
+)
+
+LIBRARY_CLEAN = InterimDataset(
+    name="library_clean",
+    path=INTERIM_LIBRARY,
+    schema=pa.schema([
+        ("track_id", pa.string()),
+        ("title", pa.string()),
+        ("artist", pa.string()),
+        ("album", pa.string()),
+        ("duration_seconds", pa.float64()),
+        ("liked", pa.bool_()),
+        ("ytm_url", pa.string()),
+        ("source", pa.string()),
+        ("extraction_date", pa.date32()),
+    ]),
+)
+
+_SPOTIFY_FIELDS = [
+    ("spotify_track_id", pa.string()),
+    ("spotify_artist_id", pa.string()),
+    ("spotify_album_id", pa.string()),
+    ("release_year", pa.string()),
+    ("duration_ms", pa.int64()),
+    ("duration_seconds", pa.float64()),
+    ("popularity", pa.int64()),
+    ("explicit", pa.bool_()),
+    ("genres", pa.string()),
+    ("match_confidence", pa.float64()),
+    ("extraction_date", pa.date32()),
+]
+
+SPOTIFY_ENRICHED_HISTORY = InterimDataset(
+    name="spotify_enriched_history",
+    path=INTERIM_SPOTIFY_HISTORY,
+    schema=pa.schema([
+        ("listening_id", pa.int64()),
+        ("source_track_id", pa.string()),
+        ("source_played_at", pa.timestamp("us", tz="UTC")),
+        ("title_original", pa.string()),
+        ("artist_original", pa.string()),
+        ("album_original", pa.string()),
+        ("source", pa.string()),
+        *_SPOTIFY_FIELDS,
+    ]),
+)
+
+SPOTIFY_ENRICHED_LIBRARY = InterimDataset(
+    name="spotify_enriched_library",
+    path=INTERIM_SPOTIFY_LIBRARY,
+    schema=pa.schema([
+        ("source_track_id", pa.string()),
+        ("title_original", pa.string()),
+        ("artist_original", pa.string()),
+        ("album_original", pa.string()),
+        ("source", pa.string()),
+        *_SPOTIFY_FIELDS,
+    ]),
+)
+
+
+# ============================================================
+# CONVERSION
+# ============================================================
+
+# Nullable pandas dtypes on read, so booleans/integers with gaps stay typed
+_PANDAS_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def _coerce_column(values: pd.Series, field: pa.Field) -> pa.Array:
+    if pa.types.is_timestamp(field.type):
+        values = pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+    elif pa.types.is_date(field.type):
+        values = pd.to_datetime(values, errors="coerce").dt.date
+    elif pa.types.is_boolean(field.type):
+        values = values.astype("boolean")
+    elif pa.types.is_integer(field.type):
+        values = pd.to_numeric(values, errors="coerce").astype("Int64")
+    elif pa.types.is_floating(field.type):
+        values = pd.to_numeric(values, errors="coerce")
+
+    return pa.array(values, type=field.type, from_pandas=True)
+
+
+def to_arrow(df: pd.DataFrame, dataset: InterimDataset) -> pa.Table:
+    """Cast a DataFrame to the dataset schema (column order included)."""
+    missing = [name for name in dataset.columns if name not in df.columns]
+    if missing:
+        raise ValueError(f"{dataset.name}: missing columns {missing}")
+
+    return pa.Table.from_arrays(
+        [_coerce_column(df[field.name], field) for field in dataset.schema],
+        schema=dataset.schema,
+    )
+
+
+# ============================================================
+# READ / WRITE
+# ============================================================
+
+def write_interim(df: pd.DataFrame, dataset: InterimDataset, path: Path | None = None, gate=None) -> Path:
+    """
+    Write a whole DataFrame as the dataset's Parquet file.
+
+    With a DQ gate (src/dq/gates.py), the table is checked first and the
+    file is not written if a threshold is breached.
+    """
+    table = to_arrow(df, dataset)
+    if gate is not None:
+        gate.update(table)
+        gate.check()
+
+    path = path or dataset.path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path)
+    return path
+
+
+def read_interim(
+    dataset: InterimDataset,
+    columns: list[str] | None = None,
+    path: Path | None = None,
+) -> pd.DataFrame:
+    """
+    Read a dataset (or only `columns` of it) into a typed DataFrame.
+
+    The file is memory-mapped, and column projection means unused columns
+    are never decoded.
+    """
+    table = pq.read_table(path or dataset.path, columns=columns, memory_map=True)
+    return table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def row_count(dataset: InterimDataset, path: Path | None = None) -> int:
+    """Rows in a dataset file, read from the Parquet footer only."""
+    return pq.ParquetFile(path or dataset.path).metadata.num_rows
+
+
+class InterimWriter:
+    """
+    Append DataFrame chunks to a dataset file, one row group per chunk.
+
+    Used by the streaming stages so an output never has to be held in
+    memory as a whole. Chunks go to a temporary file that only replaces the
+    dataset file once complete; with a DQ gate (src/dq/gates.py), every
+    chunk is folded into the gate as it is written, and the file is only
+    published if the gate passes.
+    """
+
+    def __init__(self, dataset: InterimDataset, path: Path | None = None, gate=None):
+        self.dataset = dataset
+        self.path = path or dataset.path
+        self.gate = gate
+        self.rows = 0
+        self._tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self._writer = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(self._tmp_path, self.dataset.schema)
+        return self
+
+    def write(self, df: pd.DataFrame):
+        self.write_table(to_arrow(df, self.dataset))
+
+    def write_table(self, table: pa.Table):
+        """Append a table already in the dataset schema (e.g. a row group of a part file)."""
+        if self.gate is not None:
+            self.gate.update(table)
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def __exit__(self, exc_type, exc, tb):
+        self._writer.close()
+        published = False
+        try:
+            if exc_type is None:
+                if self.gate is not None:
+                    self.gate.check()       # raises DQGateError on a breach
+                self._tmp_path.replace(self.path)
+                published = True
+        finally:
+            if not published:
+                self._tmp_path.unlink(missing_ok=True)
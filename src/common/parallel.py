@@ -0,0 +1,78 @@
+# src/common/parallel.py
+"""
+Process-pool ingestion of sharded inputs.
+
+An extractor splits its inputs into shards (files, or byte ranges of a large
+file) and hands them to `ingest_shards()`:
+- every shard is processed by a worker process, which writes its rows to its
+  own part file (a Parquet file with the dataset schema)
+- the parts are appended to the stage's InterimWriter in shard order, one row
+  group at a time, as soon as each one is done, so the output has the same
+  rows in the same order as a serial run, and is never concatenated in memory
+- the DQ gate of the writer sees every row group as it is appended
+
+Workers are spawned rather than forked, so they never inherit the parent's
+Arrow thread pools.
+"""
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import pyarrow.parquet as pq
+
+from src.common.interim import InterimWriter
+
+
+def split_evenly(items: list, weights: list[float], n: int) -> list[list]:
+    """`items` cut into at most `n` contiguous runs of about the same total weight."""
+    total = sum(weights)
+    shards, current, done = [], [], 0.0
+
+    for item, weight in zip(items, weights):
+        current.append(item)
+        done += weight
+        if done >= total * (len(shards) + 1) / n and len(shards) < n - 1:
+            shards.append(current)
+            current = []
+
+    if current:
+        shards.append(current)
+    return shards
+
+
+def append_part(writer: InterimWriter, part: Path):
+    """Append a part file to `writer` row group by row group."""
+    parquet = pq.ParquetFile(part)
+    for i in range(parquet.num_row_groups):
+        writer.write_table(parquet.read_row_group(i))
+
+
+def ingest_shards(function: Callable, shards: list, writer: InterimWriter, workers: int, *args) -> list:
+    """
+    Run `function(shard, part_path, *args)` for every shard on `workers`
+    processes and append the part files to `writer`, in shard order.
+
+    Returns what `function` returned for each shard, in shard order.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix=f".{writer.path.stem}-parts-", dir=writer.path.parent) as tmp:
+        parts = [Path(tmp) / f"part-{i:05d}.parquet" for i in range(len(shards))]
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(function, shard, part, *args) for shard, part in zip(shards, parts)]
+            try:
+                # Parts are appended as they complete, while later shards still run
+                for future, part in zip(futures, parts):
+                    results.append(future.result())
+                    append_part(writer, part)
+                    part.unlink()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    return results
@@ -0,0 +1,147 @@
+# src/common/state.py
+"""
+Local state store for incremental runs.
+
+Each Takeout export holds the full history, so an incremental run keeps a
+high-water mark of what has already been loaded:
+- the latest `played_at` seen
+- the fingerprints of the events within a lookback window before it, so
+  late or reordered events near the mark are neither lost nor loaded twice
+
+Marks are saved as *pending* by the extraction and only *committed* once the
+last load of the chain has succeeded: a failed run is simply replayed from
+the previous committed mark.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.config.paths import STATE_DIR
+
+WATCH_HISTORY_STATE = STATE_DIR / "watch_history.json"
+
+LOOKBACK = timedelta(days=2)
+
+
+def parse_played_at(value: str) -> datetime:
+    """Takeout timestamp ('2024-03-01T12:34:56.789Z') -> aware UTC datetime."""
+    played_at = datetime.fromisoformat(value)
+    if played_at.tzinfo is None:
+        played_at = played_at.replace(tzinfo=timezone.utc)
+    return played_at.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class HighWaterMark:
+    played_at: datetime
+    fingerprints: frozenset     # events played in [played_at - lookback, played_at]
+    lookback: timedelta = LOOKBACK
+
+    def is_new(self, played_at: datetime, fingerprint: int) -> bool:
+        """True if the event was not covered by this mark."""
+        if played_at > self.played_at:
+            return True
+        if played_at < self.played_at - self.lookback:
+            return False
+        return fingerprint not in self.fingerprints
+
+    def to_dict(self) -> dict:
+        return {
+            "played_at": self.played_at.isoformat(),
+            "lookback_seconds": self.lookback.total_seconds(),
+            "fingerprints": sorted(self.fingerprints),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HighWaterMark":
+        return cls(
+            played_at=parse_played_at(data["played_at"]),
+            fingerprints=frozenset(data["fingerprints"]),
+            lookback=timedelta(seconds=data["lookback_seconds"]),
+        )
+
+
+class MarkTracker:
+    """Follows the newest events of an export to build the next mark."""
+
+    def __init__(self, lookback: timedelta = LOOKBACK):
+        self.lookback = lookback
+        self.latest = None
+        self._window = []           # (played_at, fingerprint), pruned lazily
+        self._prune_at = 10_000
+
+    def add(self, played_at: datetime, fingerprint: int):
+        if self.latest is None or played_at > self.latest:
+            self.latest = played_at
+
+        if played_at >= self.latest - self.lookback:
+            self._window.append((played_at, fingerprint))
+
+        if len(self._window) >= self._prune_at:
+            self._prune()
+            self._prune_at = max(10_000, 2 * len(self._window))
+
+    def update(self, other: "MarkTracker"):
+        """Fold in the events followed by another tracker (e.g. one per worker)."""
+        for played_at, fingerprint in other._window:
+            self.add(played_at, fingerprint)
+
+    def _prune(self):
+        floor = self.latest - self.lookback
+        self._window = [event for event in self._window if event[0] >= floor]
+
+    def mark(self, previous: HighWaterMark | None = None) -> HighWaterMark | None:
+        """Mark covering everything seen (never older than `previous`)."""
+        if self.latest is None or (previous and previous.played_at >= self.latest):
+            return previous
+
+        self._prune()
+        return HighWaterMark(
+            played_at=self.latest,
+            fingerprints=frozenset(fingerprint for _, fingerprint in self._window),
+            lookback=self.lookback,
+        )
+
+
+class StateStore:
+    """JSON file holding the committed and pending marks of one dataset."""
+
+    def __init__(self, path: Path = WATCH_HISTORY_STATE):
+        self.path = path
+
+    def _read(self) -> dict:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _write(self, state: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        tmp.replace(self.path)      # atomic: a crash never leaves half a state file
+
+    def committed(self) -> HighWaterMark | None:
+        data = self._read().get("committed")
+        return HighWaterMark.from_dict(data) if data else None
+
+    def pending(self) -> HighWaterMark | None:
+        data = self._read().get("pending")
+        return HighWaterMark.from_dict(data) if data else None
+
+    def save_pending(self, mark: HighWaterMark | None):
+        state = self._read()
+        state["pending"] = mark.to_dict() if mark else None
+        self._write(state)
+
+    def commit(self) -> HighWaterMark | None:
+        """Promote the pending mark; returns the committed mark."""
+        state = self._read()
+        if state.get("pending"):
+            state["committed"] = state["pending"]
+            state["committed_at"] = datetime.now(timezone.utc).isoformat()
+            state["pending"] = None
+            self._write(state)
+
+        data = state.get("committed")
+        return HighWaterMark.from_dict(data) if data else None
@@ -0,0 +1,197 @@
+# src/common/takeout.py
+"""
+Google Takeout archives, read in place.
+
+A Takeout export is downloaded as one or more archive parts
+(takeout-20250101T120000Z-001.zip, -002.zip, ... or .tgz), and a folder such
+as playlists/ can be spread across several of them. Instead of unpacking the
+parts under data/raw/takeout/youtube_music/, the extractors read the member
+files straight out of the archives, decompressed as they are streamed:
+- `export_parts()` finds every part of an export (the newest one in a
+  directory, or the siblings of a given part)
+- `list_members()` lists the files of all parts, and `find_members()`
+  selects them by their path inside YouTube and YouTube Music/
+- a TakeoutMember opens like a Path (`member.open("rb")`), so the
+  extractors take either
+
+Zip parts are random access: listing reads the central directory only.
+A tgz is a single compressed stream, so listing it and opening one of its
+members decompress it up to that member; `read_bytes()` reads many small
+members (playlist CSVs) in one pass per archive.
+"""
+import io
+import re
+import tarfile
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+from src.config.paths import RAW_TAKEOUT_ARCHIVES_DIR
+
+ARCHIVE_SUFFIXES = (".zip", ".tgz", ".tar.gz")
+
+# Member paths, matched from the right (the top folder name is localized)
+WATCH_HISTORY_MEMBER = "history/watch-history.json"
+LIBRARY_SONGS_MEMBER = "music (library and uploads)/music library songs.csv"
+PLAYLISTS_MEMBERS = "playlists/*.csv"
+
+_PART_NUMBER = re.compile(r"-\d{3}$")
+
+
+@dataclass(frozen=True)
+class TakeoutMember:
+    archive: Path
+    name: str               # path inside the archive
+    size: int
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.name).stem
+
+    def __str__(self) -> str:
+        return f"{self.archive.name}:{self.name}"
+
+    def open(self, mode: str = "rb"):
+        """Binary stream of the member, decompressed as it is read."""
+        if mode != "rb":
+            raise ValueError("Takeout members are opened in 'rb' mode")
+        if self.archive.suffix == ".zip":
+            return _open_zip_member(self.archive, self.name)
+        return _open_tar_member(self.archive, self.name)
+
+
+@contextmanager
+def _open_zip_member(archive: Path, name: str):
+    with zipfile.ZipFile(archive) as zf, zf.open(name) as f:
+        yield f
+
+
+class _TarStream(io.RawIOBase):
+    """Member of a streamed tar as a plain readable, non-seekable stream."""
+
+    def __init__(self, f):
+        self._f = f             # tarfile's own object breaks on seekable() in stream mode
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._f.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+@contextmanager
+def _open_tar_member(archive: Path, name: str):
+    with tarfile.open(archive, "r|*") as tar:
+        for info in tar:
+            if info.name == name:
+                yield io.BufferedReader(_TarStream(tar.extractfile(info)))
+                return
+    raise FileNotFoundError(f"{name} not found in {archive}")
+
+
+# ============================================================
+# DISCOVERY
+# ============================================================
+
+def _export_name(archive: Path) -> str:
+    """'takeout-20250101T120000Z-001.zip' -> 'takeout-20250101T120000Z'."""
+    name = archive.name
+    for suffix in ARCHIVE_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return _PART_NUMBER.sub("", name)
+
+
+def is_archive(path: Path) -> bool:
+    return path.is_file() and path.name.endswith(ARCHIVE_SUFFIXES)
+
+
+def export_parts(path: Path = RAW_TAKEOUT_ARCHIVES_DIR) -> list[Path]:
+    """
+    Every part of a Takeout export: the newest export found in directory
+    `path`, or the export that archive `path` belongs to.
+    """
+    if is_archive(path):
+        directory, export = path.parent, _export_name(path)
+    else:
+        archives = sorted(p for p in path.glob("*") if is_archive(p))
+        if not archives:
+            raise FileNotFoundError(f"No Takeout archive ({', '.join(ARCHIVE_SUFFIXES)}) in {path}")
+        directory, export = path, max(_export_name(p) for p in archives)
+
+    return sorted(p for p in directory.glob("*") if is_archive(p) and _export_name(p) == export)
+
+
+def _archive_members(archive: Path) -> list[TakeoutMember]:
+    if archive.suffix == ".zip":
+        with zipfile.ZipFile(archive) as zf:
+            return [TakeoutMember(archive, info.filename, info.file_size) for info in zf.infolist() if not info.is_dir()]
+
+    with tarfile.open(archive, "r|*") as tar:
+        return [TakeoutMember(archive, info.name, info.size) for info in tar if info.isfile()]
+
+
+def list_members(parts: list[Path]) -> list[TakeoutMember]:
+    """Files of all the parts of an export, in part order."""
+    return [member for part in parts for member in _archive_members(part)]
+
+
+def find_members(members: list[TakeoutMember], pattern: str) -> list[TakeoutMember]:
+    """Members whose path ends with `pattern` (glob syntax), sorted by path."""
+    return sorted(
+        (member for member in members if PurePosixPath(member.name).match(pattern)),
+        key=lambda member: member.name,
+    )
+
+
+def export_members(pattern: str, path: Path = RAW_TAKEOUT_ARCHIVES_DIR) -> list[TakeoutMember]:
+    """Members matching `pattern` across every part of an export (see export_parts())."""
+    found = find_members(list_members(export_parts(path)), pattern)
+    if not found:
+        raise FileNotFoundError(f"No '{pattern}' in the Takeout archives of {path}")
+    return found
+
+
+def find_member(members: list[TakeoutMember], pattern: str) -> TakeoutMember:
+    found = find_members(members, pattern)
+    if not found:
+        raise FileNotFoundError(f"No '{pattern}' in the Takeout archives")
+    return found[0]
+
+
+# ============================================================
+# READ
+# ============================================================
+
+def read_bytes(sources: list) -> list[bytes]:
+    """
+    Contents of files and/or archive members, in order. Members of the same
+    archive are read in a single pass over it.
+    """
+    contents = {}
+    by_archive = {}
+    for source in sources:
+        if isinstance(source, TakeoutMember):
+            by_archive.setdefault(source.archive, set()).add(source.name)
+        else:
+            contents[source] = source.read_bytes()
+
+    for archive, names in by_archive.items():
+        if archive.suffix == ".zip":
+            with zipfile.ZipFile(archive) as zf:
+                for name in names:
+                    contents[archive, name] = zf.read(name)
+        else:
+            with tarfile.open(archive, "r|*") as tar:
+                for info in tar:
+                    if info.name in names:
+                        contents[archive, info.name] = tar.extractfile(info).read()
+
+    return [
+        contents[source.archive, source.name] if isinstance(source, TakeoutMember) else contents[source]
+        for source in sources
+    ]
@@ -10,16 +10,34 @@ DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
 INTERIM_DIR = DATA_DIR / "interim"
 PROCESSED_DIR = DATA_DIR / "processed"
+CACHE_DIR = DATA_DIR / "cache"
+STATE_DIR = DATA_DIR / "state"
+WAREHOUSE_DIR = DATA_DIR / "warehouse"
 SECRETS_DIR = PROJECT_ROOT / "secrets"
+CONFIG_DIR = PROJECT_ROOT / "src" / "config"
 
 # --- Takeout (Product B) ---
 RAW_TAKEOUT_DIR = RAW_DIR / "takeout" / "youtube_music"
 RAW_TAKEOUT_HISTORY_DIR = RAW_TAKEOUT_DIR / "history"
 RAW_TAKEOUT_LIBRARY_DIR = RAW_TAKEOUT_DIR / "music_library"
 RAW_TAKEOUT_PLAYLISTS_DIR = RAW_TAKEOUT_DIR / "playlists"
+RAW_TAKEOUT_ARCHIVES_DIR = RAW_DIR / "takeout" / "archives"   # takeout-*.zip / .tgz, lus sans extraction
 
 WATCH_HISTORY_JSON = RAW_TAKEOUT_HISTORY_DIR / "watch-history.json"
 SEARCH_HISTORY_JSON = RAW_TAKEOUT_HISTORY_DIR / "search-history.json"
+LIBRARY_SONGS_CSV = RAW_TAKEOUT_DIR / "music (library and uploads)" / "music library songs.csv"
+
+GENRE_LOOKUP_CSV = RAW_DIR / "genre_lookup" / "genre_lookup.csv"
+
+# --- Fichiers interim (schémas : src/common/interim.py) ---
+INTERIM_WATCH_HISTORY = INTERIM_DIR / "history" / "watch_history_youtube_music.parquet"
+INTERIM_SPOTIFY_HISTORY = INTERIM_DIR / "history" / "spotify_enriched_history.parquet"
+INTERIM_LIBRARY = INTERIM_DIR / "library" / "library_clean.parquet"
+INTERIM_SPOTIFY_LIBRARY = INTERIM_DIR / "library" / "spotify_enriched_library.parquet"
+
+# --- Configuration ---
+DQ_THRESHOLDS_JSON = CONFIG_DIR / "dq_thresholds.json"
+PLAYLISTS_ALLOWLIST_JSON = CONFIG_DIR / "playlists_allowlist.json"
 
 PROCESSED_HISTORY_DIR = PROCESSED_DIR / "history"
 
@@ -0,0 +1,244 @@
+# src/dq/engine.py
+"""
+Declarative data-quality engine.
+
+Checks are declared as rules and evaluated together in a single pass over
+Arrow record batches:
+- a Parquet file is streamed batch by batch, reading only the columns the
+  rules reference
+- every rule folds each batch into a small running state with vectorized
+  Arrow kernels (null counts come straight from the validity bitmaps)
+- rules the Parquet footer can answer (row and null counts, from the row
+  group statistics) are answered from it, and their columns never decoded
+- grouped rules keep per-batch partial counts, combined at the end, so
+  memory is bounded by the batch size and the number of distinct keys,
+  never by the number of rows
+
+`evaluate()` also accepts an in-memory table, DataFrame or iterable of
+batches, so the same rules can run on data that is still in flight.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+BATCH_SIZE = 512_000
+COMPACT_EVERY = 64          # partial group counts combined every N batches
+
+COUNT = "count_all"
+
+
+# ============================================================
+# RULES
+# ============================================================
+
+@dataclass(frozen=True)
+class RowCount:
+    name: str = "row_count"
+    columns: tuple[str, ...] = ()
+
+    def start(self):
+        return 0
+
+    def update(self, state, batch: pa.RecordBatch):
+        return state + batch.num_rows
+
+    def result(self, state):
+        return state
+
+    def from_metadata(self, metadata: pq.FileMetaData):
+        return metadata.num_rows
+
+
+@dataclass(frozen=True)
+class MissingCount:
+    """Null values in `column`."""
+    column: str
+    name: str = ""
+
+    def __post_init__(self):
+        if not self.name:
+            object.__setattr__(self, "name", f"missing_{self.column}")
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def start(self):
+        return 0
+
+    def update(self, state, batch: pa.RecordBatch):
+        return state + batch.column(self.column).null_count
+
+    def result(self, state):
+        return state
+
+    def from_metadata(self, metadata: pq.FileMetaData):
+        """Sum of the row group null counts (None if a statistic is missing)."""
+        index = metadata.schema.names.index(self.column)
+        total = 0
+        for i in range(metadata.num_row_groups):
+            statistics = metadata.row_group(i).column(index).statistics
+            if statistics is None or not statistics.has_null_count:
+                return None
+            total += statistics.null_count
+        return total
+
+
+@dataclass(frozen=True)
+class FutureCount:
+    """Timestamps in `column` later than `now` (the evaluation time by default)."""
+    column: str
+    name: str = "future_plays"
+    now: datetime | None = None
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def start(self):
+        return 0
+
+    def update(self, state, batch: pa.RecordBatch):
+        values = batch.column(self.column)
+        now = pa.scalar(self.now or datetime.now(timezone.utc), type=values.type)
+        return state + (pc.sum(pc.greater(values, now)).as_py() or 0)
+
+    def result(self, state):
+        return state
+
+
+@dataclass(frozen=True)
+class GroupCounts:
+    """Rows per distinct value of `columns` (nulls form their own group), as a table."""
+    name: str
+    columns: tuple[str, ...]
+
+    def start(self):
+        return []
+
+    def update(self, state, batch: pa.RecordBatch):
+        state.append(_count_groups(pa.Table.from_batches([batch]).select(list(self.columns)), self.columns))
+        if len(state) >= COMPACT_EVERY:
+            state[:] = [_combine(state, self.columns)]
+        return state
+
+    def result(self, state) -> pa.Table:
+        return _combine(state, self.columns)
+
+
+@dataclass(frozen=True)
+class DuplicateCount(GroupCounts):
+    """Rows repeating an earlier value of `columns` (like DataFrame.duplicated)."""
+
+    def result(self, state) -> int:
+        groups = super().result(state)
+        return (pc.sum(groups[COUNT]).as_py() or 0) - groups.num_rows
+
+
+def _count_groups(table: pa.Table, columns) -> pa.Table:
+    return table.group_by(list(columns), use_threads=False).aggregate([([], COUNT)])
+
+
+def _combine(partials: list, columns) -> pa.Table:
+    if not partials:
+        return pa.table({**{column: pa.array([]) for column in columns}, COUNT: pa.array([], pa.int64())})
+    counts = pa.concat_tables(partials).group_by(list(columns), use_threads=False).aggregate([(COUNT, "sum")])
+    return counts.rename_columns({f"{COUNT}_sum": COUNT}).select([*columns, COUNT])
+
+
+# ============================================================
+# EVALUATION
+# ============================================================
+
+@dataclass
+class DQResult:
+    values: dict = field(default_factory=dict)      # rule name -> value, in rule order
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def checks(self) -> list[dict]:
+        """Scalar results as the {"check", "value"} rows of a DQ log."""
+        return [
+            {"check": name, "value": value}
+            for name, value in self.values.items()
+            if not isinstance(value, pa.Table)
+        ]
+
+
+def required_columns(rules) -> list[str]:
+    return list(dict.fromkeys(column for rule in rules for column in rule.columns))
+
+
+def _batches(data, columns: list[str], batch_size: int) -> Iterable[pa.RecordBatch]:
+    if isinstance(data, (str, Path)):
+        # Only the referenced columns are read (none at all for a row count)
+        yield from pq.ParquetFile(data).iter_batches(batch_size=batch_size, columns=columns)
+    elif isinstance(data, pd.DataFrame):
+        yield from pa.Table.from_pandas(data[columns] if columns else data, preserve_index=False) \
+            .to_batches(max_chunksize=batch_size)
+    elif isinstance(data, pa.Table):
+        yield from data.to_batches(max_chunksize=batch_size)
+    elif isinstance(data, pa.RecordBatch):
+        yield data
+    else:
+        yield from data
+
+
+def _check_names(rules):
+    names = [rule.name for rule in rules]
+    duplicated = {name for name in names if names.count(name) > 1}
+    if duplicated:
+        raise ValueError(f"Duplicate DQ rule names: {', '.join(sorted(duplicated))}")
+
+
+class Evaluator:
+    """
+    Rules folded over batches as they arrive (e.g. while a stage writes
+    them out), for data that is never read back from disk as a whole.
+    """
+
+    def __init__(self, rules: list, batch_size: int = BATCH_SIZE):
+        _check_names(rules)
+        self.rules = rules
+        self.batch_size = batch_size
+        self._states = [rule.start() for rule in rules]
+
+    def update(self, data):
+        """Fold a Table, DataFrame, RecordBatch or iterable of RecordBatches."""
+        for batch in _batches(data, required_columns(self.rules), self.batch_size):
+            self._states = [rule.update(state, batch) for rule, state in zip(self.rules, self._states)]
+
+    def result(self) -> DQResult:
+        return DQResult({rule.name: rule.result(state) for rule, state in zip(self.rules, self._states)})
+
+
+def evaluate(rules: list, data, batch_size: int = BATCH_SIZE) -> DQResult:
+    """
+    Evaluate every rule in one pass over `data`: a Parquet path, a Table,
+    a DataFrame, a RecordBatch or an iterable of RecordBatches.
+    """
+    _check_names(rules)
+
+    values = {}
+    if isinstance(data, (str, Path)):
+        metadata = pq.ParquetFile(data).metadata
+        for rule in rules:
+            value = rule.from_metadata(metadata) if hasattr(rule, "from_metadata") else None
+            if value is not None:
+                values[rule.name] = value
+
+    # ---------- ONE PASS FOR EVERYTHING ELSE ---------- #
+    pending = [rule for rule in rules if rule.name not in values]
+    evaluator = Evaluator(pending, batch_size)
+    if pending:
+        evaluator.update(data)
+    values.update(evaluator.result().values)
+
+    return DQResult({rule.name: values[rule.name] for rule in rules})
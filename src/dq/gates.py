@@ -0,0 +1,98 @@
+# src/dq/gates.py
+"""
+DQ gates: thresholds checked inside the pipeline stages.
+
+Each interim dataset has thresholds in src/config/dq_thresholds.json:
+- "min_rows": fewest rows the dataset may have (not checked by the enrich
+  gate on an empty incremental delta; the full load still checks it)
+- "max_missing_pct": {column: highest % of null values}
+- "max_future": {timestamp column: most values later than now}
+
+A DQGate turns them into engine rules (engine.py). The stage that writes
+the dataset feeds the gate the batches it is already holding in memory
+(InterimWriter / write_interim), so checking costs no extra read. A
+breached threshold raises DQGateError before the output replaces the
+previous one. Loaders check the file once more before uploading, mostly
+from the Parquet footer, so a bad file never reaches the warehouse.
+"""
+import json
+from pathlib import Path
+
+from src.common.interim import InterimDataset
+from src.config.paths import DQ_THRESHOLDS_JSON
+from src.dq.engine import DQResult, Evaluator, FutureCount, MissingCount, RowCount, evaluate
+
+DQ_THRESHOLDS_FILE = DQ_THRESHOLDS_JSON
+
+
+class DQGateError(RuntimeError):
+    """A dataset breached one of its DQ thresholds."""
+
+
+def load_thresholds(path: Path = DQ_THRESHOLDS_FILE) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class DQGate:
+    """Thresholds of one dataset, checked on the batches a stage writes."""
+
+    def __init__(
+        self,
+        dataset: InterimDataset,
+        stage: str,
+        thresholds: dict | None = None,
+        check_min_rows: bool = True,
+    ):
+        self.dataset = dataset
+        self.stage = stage
+        self.check_min_rows = check_min_rows      # False for an empty incremental delta
+        self.thresholds = thresholds if thresholds is not None else load_thresholds().get(dataset.name, {})
+
+        self.rules = [RowCount()]
+        self.rules += [MissingCount(column) for column in self.thresholds.get("max_missing_pct", {})]
+        self.rules += [
+            FutureCount(column, name=f"future_{column}") for column in self.thresholds.get("max_future", {})
+        ]
+        self._evaluator = Evaluator(self.rules)
+
+    def update(self, batch):
+        """Fold a batch (Table, DataFrame or RecordBatch) passing through the stage."""
+        self._evaluator.update(batch)
+
+    def breaches(self, result: DQResult) -> list[str]:
+        rows = result["row_count"]
+        breaches = []
+
+        min_rows = self.thresholds.get("min_rows") if self.check_min_rows else None
+        if min_rows is not None and rows < min_rows:
+            breaches.append(f"{rows} rows (min {min_rows})")
+
+        for column, max_pct in self.thresholds.get("max_missing_pct", {}).items():
+            pct = 100 * result[f"missing_{column}"] / rows if rows else 0.0
+            if pct > max_pct:
+                breaches.append(f"{pct:.1f}% missing {column} (max {max_pct}%)")
+
+        for column, max_count in self.thresholds.get("max_future", {}).items():
+            count = result[f"future_{column}"]
+            if count > max_count:
+                breaches.append(f"{count} future {column} values (max {max_count})")
+
+        return breaches
+
+    def check(self, result: DQResult | None = None) -> DQResult:
+        """Raise DQGateError if a threshold is breached."""
+        result = result or self._evaluator.result()
+        breaches = self.breaches(result)
+
+        if breaches:
+            raise DQGateError(f"{self.dataset.name} failed its {self.stage} DQ gate: " + "; ".join(breaches))
+
+        print(f"🛡️ DQ gate passed ({self.stage}, {self.dataset.name}, {result['row_count']} rows)")
+        return result
+
+
+def check_file(dataset: InterimDataset, stage: str, path: Path | None = None) -> DQResult:
+    """Gate a dataset file before it is loaded (row/null counts come from its footer)."""
+    gate = DQGate(dataset, stage)
+    return gate.check(evaluate(gate.rules, path or dataset.path))
@@ -0,0 +1,179 @@
+# src/enrichment/cache.py
+"""
+Persistent Spotify lookup cache shared by the library and history enrichers.
+
+Backed by a single SQLite file, so results survive between runs:
+- track searches keyed on the normalized (title, artist) pair
+- artist genres keyed on the Spotify artist ID
+- "no match" answers are cached too (negative entries, shorter TTL)
+- entries expire after a TTL and the least recently used ones are evicted
+  once the cache grows past `max_entries`
+- one connection guarded by a lock, so concurrent workers can share it
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from src.config.paths import CACHE_DIR
+
+CACHE_FILE = CACHE_DIR / "spotify_enrichment.sqlite"
+
+DAY = 24 * 3600
+
+TRACKS = "track"
+ARTIST_GENRES = "artist_genres"
+
+
+def normalize_key(*parts) -> str:
+    """Case/whitespace-insensitive key, e.g. (' Girl! ', 'DAFT  punk') -> 'girl!\\x1fdaft punk'."""
+    return "\x1f".join(" ".join(str(part).split()).casefold() for part in parts)
+
+
+class EnrichmentCache:
+    """SQLite-backed key/value cache with TTL, negative entries and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Path = CACHE_FILE,
+        ttl_days: float = 30,
+        negative_ttl_days: float = 7,
+        max_entries: int = 500_000,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl_days * DAY
+        self.negative_ttl = negative_ttl_days * DAY
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace   TEXT NOT NULL,
+                key         TEXT NOT NULL,
+                value       TEXT,           -- JSON, NULL = negative result
+                created_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        self.purge_expired()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ---------------- GENERIC ---------------- #
+    def get(self, namespace: str, key: str):
+        """Return (hit, value). A hit with value None is a cached "no match"."""
+        with self._lock:
+            return self._get(namespace, key)
+
+    def _get(self, namespace: str, key: str):
+        row = self._conn.execute(
+            "SELECT value, created_at FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+
+        now = time.time()
+        if row is not None:
+            value, created_at = row
+            ttl = self.ttl if value is not None else self.negative_ttl
+            if now - created_at <= ttl:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, key),
+                )
+                self.hits += 1
+                return True, None if value is None else json.loads(value)
+
+        self.misses += 1
+        return False, None
+
+    def values(self, namespace: str):
+        """Yield (key, value) for every unexpired positive entry of a namespace."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM entries WHERE namespace = ? AND value IS NOT NULL AND created_at >= ?",
+                (namespace, time.time() - self.ttl),
+            ).fetchall()
+
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def put(self, namespace: str, key: str, value):
+        with self._lock:
+            self._put(namespace, key, value)
+
+    def _put(self, namespace: str, key: str, value):
+        exists = self._conn.execute(
+            "SELECT 1 FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+
+        now = time.time()
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO entries (namespace, key, value, created_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (namespace, key, None if value is None else json.dumps(value), now, now),
+        )
+
+        if not exists:
+            self._count += 1
+        if self._count > self.max_entries:
+            self._evict(self._count - self.max_entries)
+
+    def _evict(self, n: int):
+        """Drop the n least recently used entries."""
+        self._conn.execute(
+            """
+            DELETE FROM entries WHERE rowid IN (
+                SELECT rowid FROM entries ORDER BY accessed_at LIMIT ?
+            )
+            """,
+            (n,),
+        )
+        self._count -= n
+
+    def purge_expired(self):
+        now = time.time()
+        self._conn.execute(
+            """
+            DELETE FROM entries
+            WHERE (value IS NOT NULL AND created_at < ?)
+               OR (value IS NULL AND created_at < ?)
+            """,
+            (now - self.ttl, now - self.negative_ttl),
+        )
+
+    # ---------------- SPOTIFY LOOKUPS ---------------- #
+    def get_track(self, title: str, artist: str):
+        return self.get(TRACKS, normalize_key(title, artist))
+
+    def put_track(self, title: str, artist: str, item: dict | None):
+        self.put(TRACKS, normalize_key(title, artist), item)
+
+    def get_artist_genres(self, artist_id: str):
+        return self.get(ARTIST_GENRES, artist_id)
+
+    def put_artist_genres(self, artist_id: str, genres: list | None):
+        self.put(ARTIST_GENRES, artist_id, genres)
+
+    # ---------------- LIFECYCLE ---------------- #
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
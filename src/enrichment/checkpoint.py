@@ -0,0 +1,111 @@
+# src/enrichment/checkpoint.py
+"""
+Checkpointed enrichment runs.
+
+Distinct track keys are enriched in fixed-size chunks and every finished
+chunk is written to disk straight away:
+- one Parquet part file per chunk (one row per key, unmatched keys included)
+- a JSON manifest listing the completed parts, rewritten atomically after
+  each part, so a crash can never leave a half-written part referenced
+
+A run started with `resume=True` reloads the completed parts and only
+enriches the keys they do not cover; a killed run loses at most one chunk.
+The checkpoint is cleared once the final output has been written.
+"""
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config.paths import STATE_DIR
+
+CHECKPOINT_DIR = STATE_DIR / "checkpoints"
+CHUNK_KEYS = 250
+
+MANIFEST = "manifest.json"
+
+
+class EnrichmentCheckpoint:
+    """Part files + manifest for one enrichment output."""
+
+    def __init__(self, name: str, directory: Path = CHECKPOINT_DIR):
+        self.path = directory / name
+        self.manifest_path = self.path / MANIFEST
+
+    # ---------------- MANIFEST ---------------- #
+    def _manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {"parts": [], "keys_done": 0}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+    def _save_manifest(self, manifest: dict):
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp.replace(self.manifest_path)
+
+    # ---------------- LIFECYCLE ---------------- #
+    def start(self, resume: bool = False) -> pd.DataFrame:
+        """Open the checkpoint; returns the results already on disk (empty unless resuming)."""
+        if not resume:
+            self.clear()
+        self.path.mkdir(parents=True, exist_ok=True)
+        return self.results()
+
+    def write_part(self, part: pd.DataFrame):
+        manifest = self._manifest()
+        name = f"part-{len(manifest['parts']):05d}.parquet"
+
+        tmp = self.path / f"{name}.tmp"
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp)
+        tmp.replace(self.path / name)
+
+        manifest["parts"].append(name)
+        manifest["keys_done"] += len(part)
+        self._save_manifest(manifest)
+
+    def results(self) -> pd.DataFrame:
+        """Every key enriched so far, in completion order."""
+        parts = [
+            pq.read_table(self.path / name).to_pandas()
+            for name in self._manifest()["parts"]
+        ]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def enrich_in_chunks(
+    keys: pd.DataFrame,
+    enrich_chunk,
+    checkpoint: EnrichmentCheckpoint,
+    resume: bool = False,
+    chunk_size: int = CHUNK_KEYS,
+) -> pd.DataFrame:
+    """
+    Run `enrich_chunk` over `keys` chunk by chunk, checkpointing each result.
+
+    `enrich_chunk(chunk)` must return one row per key of `chunk`, with the
+    key columns included. Returns the results for every key.
+    """
+    key_columns = list(keys.columns)
+    done = checkpoint.start(resume)
+
+    if len(done):
+        # Anti-join: only the keys not covered by a completed part
+        covered = keys.merge(done[key_columns], on=key_columns, how="left", indicator=True)
+        todo = keys[(covered["_merge"] == "left_only").to_numpy()]
+        print(f"⏯️ Resuming: {len(keys) - len(todo)}/{len(keys)} keys already enriched")
+    else:
+        todo = keys
+
+    for start in range(0, len(todo), chunk_size):
+        checkpoint.write_part(enrich_chunk(todo.iloc[start:start + chunk_size]))
+        print(f"💾 Checkpoint: {len(keys) - len(todo) + min(start + chunk_size, len(todo))}/{len(keys)} keys")
+
+    return checkpoint.results()
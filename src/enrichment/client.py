@@ -0,0 +1,359 @@
+# src/enrichment/client.py
+"""
+Spotify Web API client shared by the library and history enrichers.
+"""
+import requests
+import random
+import threading
+import time
+import json
+from requests.adapters import HTTPAdapter
+
+from src.config.paths import SECRETS_DIR
+from src.enrichment.matching import MIN_CONFIDENCE, rank_candidates
+
+SECRETS_FILE = SECRETS_DIR / "spotify_credentials.json"
+
+API_URL = "https://api.spotify.com/v1"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+BATCH_SIZE = 50  # max IDs per /v1/artists and /v1/tracks call
+
+# Transport
+POOL_SIZE = 16              # keep-alive connections kept open per host
+REQUEST_TIMEOUT = 10        # seconds
+MAX_RETRIES = 5             # per request, whatever the cause (401, 429, 5xx, network)
+BACKOFF_BASE = 0.5          # seconds, doubled on each attempt
+BACKOFF_MAX = 30
+TOKEN_REFRESH_MARGIN = 60   # refresh this many seconds before expires_in
+
+
+class SpotifyClient:
+    """
+    Wrapper Spotify API (Client Credentials Flow)
+    - Handles token generation, refreshed ahead of its `expires_in`
+    - One pooled keep-alive session (no new TCP/TLS handshake per call)
+    - Handles rate limits (429) and transient errors with capped retries
+      (jittered exponential backoff)
+    - Provides track search + artist lookup (single and batched by 50)
+    - Provides caching for artist metadata
+    - Optionally answers searches from a local MatchIndex first, and
+      re-ranks remote candidates by similarity (score kept as
+      `match_confidence`) instead of trusting the first result
+    - Optionally uses a persistent cache (EnrichmentCache) shared across
+      runs, so already-resolved lookups never hit the API again
+    - Thread-safe: can be shared by concurrent workers, with an optional
+      RateLimiter spacing out requests and pausing everyone on 429
+    """
+
+    def __init__(
+        self,
+        cache=None,
+        rate_limiter=None,
+        credentials_file=SECRETS_FILE,
+        api_url=API_URL,
+        token_url=TOKEN_URL,
+        pool_size=POOL_SIZE,
+        max_retries=MAX_RETRIES,
+        matcher=None,
+    ):
+        self.api_url = api_url
+        self.token_url = token_url
+        self.max_retries = max_retries
+        self._load_credentials(credentials_file)
+        self.session = self._build_session(pool_size)
+        self.token = None  # generated on the first API call
+        self.token_expires_at = 0.0
+        self.cache = cache
+        self.matcher = matcher
+        self.rate_limiter = rate_limiter
+        self.artist_cache = {}  # prevent 800 calls for same artist
+        self._errors = threading.local()  # failed calls per thread (never cached as "no match")
+        self._token_lock = threading.Lock()
+
+    def _load_credentials(self, credentials_file):
+        with open(credentials_file, "r") as f:
+            creds = json.load(f)
+            self.client_id = creds["client_id"]
+            self.client_secret = creds["client_secret"]
+
+    @staticmethod
+    def _build_session(pool_size):
+        """Shared session: connections are reused across calls and threads."""
+        session = requests.Session()
+        # Retries are handled in _request (they must go through the rate limiter)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        self.session.close()
+
+    def _generate_token(self):
+        """Get access token using client_credentials flow."""
+        url = self.token_url
+        resp = self.session.post(url, {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret
+        }, timeout=REQUEST_TIMEOUT)
+
+        if resp.status_code != 200:
+            raise Exception(f"Failed to authenticate Spotify API: {resp.text}")
+
+        data = resp.json()
+        expires_in = data.get("expires_in", 3600)
+        self.token_expires_at = time.monotonic() + max(0, expires_in - TOKEN_REFRESH_MARGIN)
+        return data["access_token"]
+
+    def _refresh_token(self, stale_token):
+        """Regenerate the token once, even if several threads see it expire."""
+        with self._token_lock:
+            if self.token == stale_token:
+                self.token = self._generate_token()
+
+    def _current_token(self):
+        """Valid token, refreshed proactively shortly before it expires."""
+        token = self.token
+        if token is None or time.monotonic() >= self.token_expires_at:
+            self._refresh_token(token)
+        return self.token
+
+    @property
+    def errors(self):
+        return getattr(self._errors, "count", 0)
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff, so retrying workers do not synchronize."""
+        if attempt < self.max_retries:  # no point waiting after the last attempt
+            time.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+
+    def _request(self, url, params=None):
+        """Generic GET with rate-limit handling and capped retries."""
+        for attempt in range(self.max_retries + 1):
+            token = self._current_token()
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            headers = {"Authorization": f"Bearer {token}"}
+
+            try:
+                r = self.session.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                # Network error → back off and retry
+                error = f"{type(e).__name__}: {e}"
+                self._backoff(attempt)
+                continue
+
+            if r.status_code == 200:
+                return r.json()
+
+            error = f"{r.status_code} - {r.text}"
+
+            # Token revoked/expired early → refresh and retry
+            if r.status_code == 401:
+                self._refresh_token(token)
+                continue
+
+            # Rate limit → wait and retry (all workers wait when shared)
+            if r.status_code == 429:
+                wait = int(r.headers.get("Retry-After", 2))
+                print(f"⏳ Rate limited — waiting {wait}s...")
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(wait)
+                else:
+                    time.sleep(wait)
+                continue
+
+            # Server error → back off and retry
+            if r.status_code >= 500:
+                self._backoff(attempt)
+                continue
+
+            break  # other client errors will not succeed on retry
+
+        print(f"⚠ Spotify API Error: {error}")
+        self._errors.count = self.errors + 1
+        return None
+
+    # ---------------- TRACK SEARCH ---------------- #
+    def search_track(self, track_name, artist_name, duration_seconds=None):
+        """Search for a track (persistent cache, then local index, then API)."""
+        if self.cache is not None:
+            hit, item = self.cache.get_track(track_name, artist_name)
+            if hit:
+                return item
+
+        item = self.matcher.lookup(track_name, artist_name, duration_seconds) if self.matcher else None
+        if item is not None:
+            if self.cache is not None:
+                self.cache.put_track(track_name, artist_name, _trim_track(item))
+            return item
+
+        errors_before = self.errors
+        item = self._search_track(track_name, artist_name, duration_seconds)
+
+        if self.errors == errors_before:
+            if self.cache is not None:
+                self.cache.put_track(track_name, artist_name, _trim_track(item))
+            if self.matcher is not None:
+                self.matcher.add(track_name, artist_name, _trim_track(item))
+        return item
+
+    def _search_track(self, track_name, artist_name, duration_seconds=None):
+        """Search for a track with track + artist."""
+        query = f"track:{track_name} artist:{artist_name}"
+        url = f"{self.api_url}/search"
+        params = {
+            "q": query,
+            "type": "track",
+            "limit": 5
+        }
+
+        data = self._request(url, params)
+        if data is None or not data["tracks"]["items"]:
+            # Fallback: search only by track title
+            fallback = self._fallback_search(track_name, artist_name, duration_seconds)
+            return fallback
+
+        return _best_match(track_name, artist_name, data["tracks"]["items"], duration_seconds)
+
+    def _fallback_search(self, track_name, artist_name, duration_seconds=None):
+        """Second chance search: track only (candidates still checked against the artist)."""
+        print(f"🔎 Fallback search: {track_name}")
+        url = f"{self.api_url}/search"
+        params = {
+            "q": f"track:{track_name}",
+            "type": "track",
+            "limit": 5
+        }
+
+        data = self._request(url, params)
+        if data is None or not data["tracks"]["items"]:
+            return None
+
+        return _best_match(track_name, artist_name, data["tracks"]["items"], duration_seconds)
+
+    # ---------------- ARTIST METADATA (GENRES) ---------------- #
+    def get_artist_genres(self, artist_id):
+        """Fetch artist genres (cached to avoid redundant API calls)."""
+        if artist_id in self.artist_cache:
+            return self.artist_cache[artist_id]
+
+        if self.cache is not None:
+            hit, genres = self.cache.get_artist_genres(artist_id)
+            if hit:
+                self.artist_cache[artist_id] = genres or []
+                return self.artist_cache[artist_id]
+
+        url = f"{self.api_url}/artists/{artist_id}"
+        data = self._request(url)
+
+        if data is None:
+            # Failed lookup: keep it for this run only, retry next run
+            self.artist_cache[artist_id] = []
+            return []
+
+        genres = data.get("genres", [])
+        self.artist_cache[artist_id] = genres
+        if self.cache is not None:
+            self.cache.put_artist_genres(artist_id, genres)
+        return genres
+
+    # ---------------- BATCHED LOOKUPS ---------------- #
+    def get_artists_batch(self, artist_ids):
+        """Fetch up to 50 artists in one call (list aligned with artist_ids)."""
+        return self._get_batch("artists", artist_ids)
+
+    def get_tracks_batch(self, track_ids):
+        """Fetch up to 50 tracks in one call (list aligned with track_ids)."""
+        return self._get_batch("tracks", track_ids)
+
+    def _get_batch(self, kind, ids):
+        if len(ids) > BATCH_SIZE:
+            raise ValueError(f"At most {BATCH_SIZE} {kind} per request, got {len(ids)}")
+
+        data = self._request(f"{self.api_url}/{kind}", {"ids": ",".join(ids)})
+        if data is None:
+            return None
+
+        return data.get(kind) or [None] * len(ids)
+
+    def get_artists_genres(self, artist_ids):
+        """
+        Genres for up to 50 artists -> {artist_id: [genres]}.
+
+        Cached artists are served locally; the rest are fetched with a
+        single batched call.
+        """
+        genres = {}
+        to_fetch = []
+
+        for artist_id in dict.fromkeys(artist_ids):
+            if artist_id in self.artist_cache:
+                genres[artist_id] = self.artist_cache[artist_id]
+                continue
+
+            if self.cache is not None:
+                hit, cached = self.cache.get_artist_genres(artist_id)
+                if hit:
+                    genres[artist_id] = self.artist_cache[artist_id] = cached or []
+                    continue
+
+            to_fetch.append(artist_id)
+
+        if not to_fetch:
+            return genres
+
+        artists = self.get_artists_batch(to_fetch)
+
+        if artists is None:
+            # Failed lookup: keep it for this run only, retry next run
+            for artist_id in to_fetch:
+                genres[artist_id] = self.artist_cache[artist_id] = []
+            return genres
+
+        for artist_id, artist in zip(to_fetch, artists):
+            artist_genres = (artist or {}).get("genres", [])
+            genres[artist_id] = self.artist_cache[artist_id] = artist_genres
+            if self.cache is not None:
+                self.cache.put_artist_genres(artist_id, artist_genres)
+
+        return genres
+
+
+def _best_match(track_name, artist_name, items, duration_seconds=None):
+    """Most similar candidate with its score, or None if none is close enough."""
+    ranked = rank_candidates(track_name, artist_name, items, duration_seconds)
+    if not ranked or ranked[0][1] < MIN_CONFIDENCE:
+        return None
+
+    item, score = ranked[0]
+    return dict(item, match_confidence=score)
+
+
+def _trim_track(item):
+    """Keep only the track fields the enrichers use (smaller cache entries)."""
+    if not item:
+        return None
+
+    album = item.get("album") or {}
+    return {
+        "id": item.get("id"),
+        "name": item.get("name"),
+        "duration_ms": item.get("duration_ms"),
+        "popularity": item.get("popularity"),
+        "explicit": item.get("explicit"),
+        "match_confidence": item.get("match_confidence"),
+        "album": {
+            "id": album.get("id"),
+            "name": album.get("name"),
+            "release_date": album.get("release_date"),
+        },
+        "artists": [
+            {"id": artist.get("id"), "name": artist.get("name")}
+            for artist in item.get("artists") or []
+        ],
+    }
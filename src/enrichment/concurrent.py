@@ -0,0 +1,61 @@
+# src/enrichment/concurrent.py
+"""
+Concurrent Spotify lookups.
+
+Searches and artist lookups run on a bounded thread pool sharing one
+SpotifyClient (and therefore one RateLimiter and one cache). Results are
+returned in input order, so the enriched output is deterministic whatever
+the number of workers.
+
+Enrichment is two-phase: all track matches are resolved first, then the
+distinct artist IDs they reference are fetched 50 at a time through the
+batched /v1/artists endpoint (~50x fewer artist requests).
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 8
+ARTIST_BATCH_SIZE = 50
+LOG_EVERY = 30
+
+
+def _map_ordered(func, values: list, workers: int, label: str) -> list:
+    results = []
+
+    if workers <= 1:
+        mapped = map(func, values)
+        pool = None
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        mapped = pool.map(func, values)  # yields in input order
+
+    try:
+        for idx, result in enumerate(mapped, start=1):
+            results.append(result)
+            if idx % LOG_EVERY == 0:
+                print(f"   → {idx}/{len(values)} {label} processed")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return results
+
+
+def search_tracks(client, keys: list[tuple], workers: int = DEFAULT_WORKERS) -> list:
+    """Search every (title, artist) key; item (or None) per key, in order."""
+    return _map_ordered(lambda key: client.search_track(*key), keys, workers, "tracks")
+
+
+def fetch_artist_genres(client, artist_ids: list, workers: int = DEFAULT_WORKERS) -> dict:
+    """Fetch genres for each distinct artist ID -> {artist_id: [genres]}."""
+    distinct_ids = list(dict.fromkeys(artist_ids))
+    batches = [
+        distinct_ids[i:i + ARTIST_BATCH_SIZE]
+        for i in range(0, len(distinct_ids), ARTIST_BATCH_SIZE)
+    ]
+
+    genres = {}
+    for batch_genres in _map_ordered(client.get_artists_genres, batches, workers, "artist batches"):
+        genres.update(batch_genres)
+
+    # Insertion order = first appearance, whatever the batching
+    return {artist_id: genres[artist_id] for artist_id in distinct_ids}
@@ -0,0 +1,37 @@
+# src/enrichment/dedup.py
+"""
+Deduplicate-before-enrich stage.
+
+A listening history repeats the same track hundreds of times. The history
+is reduced to its distinct track keys, only those are enriched, and the
+result is joined back onto every play event with one vectorized merge,
+so enrichment cost scales with distinct tracks instead of total plays.
+"""
+import pandas as pd
+
+TRACK_KEYS = ["track_id", "title", "artist"]
+
+
+def distinct_tracks(plays: pd.DataFrame, keys: list[str] = TRACK_KEYS) -> pd.DataFrame:
+    """Distinct key rows of `plays` (first-appearance order), with the dedup ratio logged."""
+    tracks = plays[keys].drop_duplicates(ignore_index=True)
+
+    ratio = len(plays) / len(tracks) if len(tracks) else 0
+    print(f"📉 Dedup: {len(plays)} rows → {len(tracks)} distinct tracks ({ratio:.1f}x fewer)")
+    return tracks
+
+
+def join_back(
+    plays: pd.DataFrame,
+    enriched: pd.DataFrame,
+    keys: list[str] = TRACK_KEYS,
+    how: str = "inner",
+) -> pd.DataFrame:
+    """
+    Attach the enriched columns to every play event.
+
+    Inner join by default: plays whose track found no match are dropped.
+    With how="left" they are kept, with null enriched columns. Play order is
+    preserved.
+    """
+    return plays.merge(enriched, on=keys, how=how, validate="many_to_one")
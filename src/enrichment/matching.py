@@ -0,0 +1,214 @@
+# src/enrichment/matching.py
+"""
+Local fuzzy matching for Spotify track lookups.
+
+- `similarity()` scores a Spotify candidate against a (title, artist) query:
+  character-trigram Jaccard on normalized titles and artists (accents,
+  punctuation, "(Official Video)", "feat. X", "Remastered" and " - Topic"
+  removed), plus the duration when the query has one. Version qualifiers
+  (remix, live, acoustic, ...) and numbers (parts, volumes, years) are kept,
+  and a candidate whose version or numbers differ from the query's is never
+  a match
+- `rank_candidates()` re-ranks the candidates returned by a search instead
+  of blindly trusting the first one
+- `MatchIndex` holds every track already resolved (seeded from the
+  persistent cache), so a query that only differs in spelling from a known
+  one is answered locally instead of with one or two more searches
+
+Trigram sets are compared within the bucket of tracks sharing the query's
+normalized artist, which keeps lookups cheap without MinHash signatures at
+the scale of a personal library.
+"""
+import re
+import threading
+import unicodedata
+
+from src.enrichment.cache import TRACKS
+
+TITLE_WEIGHT = 0.6
+ARTIST_WEIGHT = 0.4
+DURATION_WEIGHT = 0.1       # share of the score given to duration, when known
+DURATION_TOLERANCE = 30     # seconds of difference that bring the duration score to 0
+
+MIN_CONFIDENCE = 0.5        # below this, a remote candidate is not a match
+INDEX_MIN_SCORE = 0.85      # a local answer must be at least this close
+VERSION_MISMATCH = 0.4      # score factor when versions differ (keeps it below MIN_CONFIDENCE)
+
+# A different recording of the same song: kept in the normalized title
+VERSION_WORDS = frozenset({
+    "remix", "mix", "live", "acoustic", "edit", "instrumental", "karaoke", "unplugged", "demo",
+})
+
+_BRACKETS = re.compile(r"\(([^)]*)\)|\[([^\]]*)\]")
+_NOISE_BRACKET = re.compile(r"^(?:feat|ft|featuring)\b|remaster")
+_REMASTER_SUFFIX = re.compile(r"\s-\s[^-]*remaster[^-]*$")
+_FEATURING = re.compile(r"\s(?:feat\.?|ft\.?|featuring)\s.*$")
+_TOPIC_SUFFIX = re.compile(r"\s*-\s*topic\s*$")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+# ============================================================
+# NORMALIZATION & SIMILARITY
+# ============================================================
+
+def _words(text: str) -> list[str]:
+    return _NON_WORD.sub(" ", text).split()
+
+
+def _qualifier(match: re.Match) -> str:
+    """
+    A bracketed qualifier, kept only if it names a version or has a number
+    ('(Live)', '(Part 1)', '(Alive 2007)'; not '(Official Video)', '(feat. X)'
+    or '(2011 Remaster)').
+    """
+    words = _words(match.group(1) or match.group(2) or "")
+    if _NOISE_BRACKET.search(" ".join(words)):
+        return " "
+    return f" {' '.join(words)} " if versions(" ".join(words)) else " "
+
+
+def normalize(text: str | None) -> str:
+    """'Girl! (Official Video) feat. Mr Oizo' -> 'girl', 'Girl (Live)' -> 'girl live'."""
+    if not text:
+        return ""
+
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = _TOPIC_SUFFIX.sub("", text)
+    text = _REMASTER_SUFFIX.sub("", text)
+
+    # Version qualifiers are moved out of the way of the "feat. X" tail
+    qualifiers = []
+    text = _BRACKETS.sub(lambda match: qualifiers.append(_qualifier(match)) or " ", text)
+    text = _FEATURING.sub("", text)
+    return " ".join(_words(text + "".join(qualifiers)))
+
+
+def versions(title: str) -> frozenset:
+    """
+    What tells recordings of a song apart in a normalized title: version
+    words and numbers ('wall pt 01 live' -> {'1', 'live'}).
+    """
+    words = title.split()
+    numbers = {
+        str(int(word)) if word.isdigit() else word      # 'pt 01' is 'pt 1'
+        for word in words
+        if any(char.isdigit() for char in word)
+    }
+    return VERSION_WORDS.intersection(words) | numbers
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def similarity(track_name: str, artist_name: str, item: dict, duration_seconds: float | None = None) -> float:
+    """Score in [0, 1] of a Spotify track `item` for a (title, artist) query."""
+    query_title, item_title = normalize(track_name), normalize(item.get("name"))
+    title_score = _jaccard(trigrams(query_title), trigrams(item_title))
+
+    query_artist = trigrams(normalize(artist_name))
+    artist_names = [artist.get("name") for artist in item.get("artists") or []]
+    artist_score = max(
+        [_jaccard(query_artist, trigrams(normalize(name))) for name in artist_names]
+        + [_jaccard(query_artist, trigrams(normalize(" ".join(filter(None, artist_names)))))]
+    )
+
+    score = TITLE_WEIGHT * title_score + ARTIST_WEIGHT * artist_score
+
+    duration_ms = item.get("duration_ms")
+    if duration_seconds and duration_ms:
+        gap = abs(duration_ms / 1000 - duration_seconds)
+        duration_score = max(0.0, 1 - gap / DURATION_TOLERANCE)
+        score = (1 - DURATION_WEIGHT) * score + DURATION_WEIGHT * duration_score
+
+    # "One More Time (Live)" is not "One More Time", nor "Pt. 1" "Pt. 2",
+    # however close the titles
+    if versions(query_title) != versions(item_title):
+        score *= VERSION_MISMATCH
+
+    return round(score, 3)
+
+
+def rank_candidates(track_name, artist_name, items: list, duration_seconds=None) -> list[tuple[dict, float]]:
+    """Candidates sorted by similarity, best first (ties keep Spotify's order)."""
+    scored = [(item, similarity(track_name, artist_name, item, duration_seconds)) for item in items if item]
+    return sorted(scored, key=lambda pair: pair[1], reverse=True)
+
+
+# ============================================================
+# LOCAL INDEX
+# ============================================================
+
+class MatchIndex:
+    """In-memory index of resolved tracks, bucketed by normalized artist."""
+
+    def __init__(self):
+        self._exact = {}        # (title, artist) normalized -> item
+        self._by_artist = {}    # artist normalized -> [(title trigrams, item)]
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._exact)
+
+    @classmethod
+    def from_cache(cls, cache) -> "MatchIndex":
+        """Seed the index with every positive track lookup in the persistent cache."""
+        index = cls()
+        for key, item in cache.values(TRACKS):
+            track_name, _, artist_name = key.partition("\x1f")
+            index.add(track_name, artist_name, item)
+        return index
+
+    def _add(self, track_name, artist_name, item):
+        key = (normalize(track_name), normalize(artist_name))
+        if not all(key) or key in self._exact:
+            return
+        self._exact[key] = item
+        self._by_artist.setdefault(key[1], []).append((trigrams(key[0]), item))
+
+    def add(self, track_name: str, artist_name: str, item: dict | None):
+        """Index a resolved item under the query and under its own Spotify name."""
+        if not item:
+            return
+        with self._lock:
+            self._add(track_name, artist_name, item)
+            # A query spelled exactly like the Spotify track is a certain match
+            canonical = dict(item, match_confidence=1.0)
+            for artist in item.get("artists") or []:
+                self._add(item.get("name"), artist.get("name"), canonical)
+
+    def lookup(self, track_name: str, artist_name: str, duration_seconds=None) -> dict | None:
+        """Indexed item for this query, if one is close enough (with its confidence)."""
+        title, artist = normalize(track_name), normalize(artist_name)
+
+        with self._lock:
+            exact = self._exact.get((title, artist))
+            candidates = list(self._by_artist.get(artist, []))
+
+        # Same normalized query as an earlier resolution, else the closest title;
+        # either way the item is scored against this query
+        if exact is not None:
+            item = exact
+        else:
+            query = trigrams(title)
+            best = max(candidates, key=lambda pair: _jaccard(query, pair[0]), default=None)
+            if best is None:
+                return None
+            item = best[1]
+
+        score = similarity(track_name, artist_name, item, duration_seconds)
+        if score < INDEX_MIN_SCORE:
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return dict(item, match_confidence=score)
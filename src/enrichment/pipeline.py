@@ -0,0 +1,195 @@
+# src/enrichment/pipeline.py
+"""
+Spotify enrichment engine shared by the library and history products.
+
+Both products run the same pipeline, only the input/output schema differs
+(an EnrichmentSpec):
+1. read the source interim dataset and keep rows with a title and artist
+2. reduce them to distinct tracks (dedup.py)
+3. enrich the distinct tracks in checkpointed chunks (checkpoint.py):
+   concurrent searches, then artist genres in batches of 50 (concurrent.py),
+   all through one pooled client, rate limiter, persistent cache and local
+   matching index (matching.py)
+4. join the Spotify columns back onto every source row, rename the source
+   columns, gate the result (unmatched rows included) and write the matched
+   rows as the output interim dataset
+"""
+import pandas as pd
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.common.interim import InterimDataset, read_interim, to_arrow, write_interim
+from src.dq.gates import DQGate
+from src.enrichment.cache import EnrichmentCache
+from src.enrichment.checkpoint import EnrichmentCheckpoint, enrich_in_chunks
+from src.enrichment.client import SpotifyClient
+from src.enrichment.concurrent import DEFAULT_WORKERS, fetch_artist_genres, search_tracks
+from src.enrichment.dedup import TRACK_KEYS, distinct_tracks, join_back
+from src.enrichment.matching import MatchIndex
+from src.enrichment.rate_limit import DEFAULT_MAX_RPS, RateLimiter
+
+SPOTIFY_COLUMNS = [
+    "spotify_track_id",
+    "spotify_artist_id",
+    "spotify_album_id",
+    "release_year",
+    "duration_ms",
+    "duration_seconds",
+    "popularity",
+    "explicit",
+    "genres",
+    "match_confidence",
+]
+
+
+@dataclass(frozen=True)
+class EnrichmentSpec:
+    """What to read, how to dedup, and how to name the output columns."""
+    source: InterimDataset
+    output: InterimDataset
+    input_columns: list[str]
+    renames: dict[str, str]                 # source column -> output column
+    keys: list[str] = field(default_factory=lambda: list(TRACK_KEYS))
+    unit: str = "rows"                      # what a source row is, for logs
+
+
+# ============================================================
+# ROW MAPPING
+# ============================================================
+
+def enrich_tracks(client, tracks: pd.DataFrame, workers: int = DEFAULT_WORKERS) -> pd.DataFrame:
+    """Spotify columns for a chunk of distinct tracks (one row per track, unmatched included)."""
+
+    # ---------- PHASE 1: TRACK SEARCH (CONCURRENT) ---------- #
+    track_keys = list(dict.fromkeys(zip(tracks["title"], tracks["artist"])))
+    items = dict(zip(track_keys, search_tracks(client, track_keys, workers)))
+
+    for (track_name, artist_name), item in items.items():
+        if not item:
+            print(f"⚠ No match found: {track_name} — {artist_name}")
+
+    # ---------- PHASE 2: ARTIST GENRES (BATCHES OF 50, CONCURRENT) ---------- #
+    artist_ids = [item["artists"][0]["id"] for item in items.values() if item]
+    genres_by_artist = fetch_artist_genres(client, artist_ids, workers)
+
+    # ---------- ONE ROW PER DISTINCT TRACK ---------- #
+    key_columns = list(tracks.columns)
+    enriched = []
+
+    for track in tracks.itertuples(index=False):
+        row = dict(zip(key_columns, track))
+        item = items[(row["title"], row["artist"])]
+
+        if item:
+            duration_ms = item.get("duration_ms")
+            album = item.get("album") or {}
+            spotify_artist_id = item["artists"][0]["id"]
+            genres = genres_by_artist[spotify_artist_id]
+
+            row.update({
+                "spotify_track_id": item.get("id"),
+                "spotify_artist_id": spotify_artist_id,
+                "spotify_album_id": album.get("id"),
+                "release_year": (album.get("release_date") or "")[:4],
+                "duration_ms": duration_ms,
+                "duration_seconds": round(duration_ms / 1000, 2) if duration_ms else None,
+                "popularity": item.get("popularity"),
+                "explicit": item.get("explicit"),
+                "genres": ", ".join(genres) if genres else None,
+                "match_confidence": item.get("match_confidence"),
+            })
+
+        enriched.append(row)
+
+    return pd.DataFrame(enriched, columns=key_columns + SPOTIFY_COLUMNS)
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+def run_enrichment(
+    spec: EnrichmentSpec,
+    workers: int = DEFAULT_WORKERS,
+    max_rps: float = DEFAULT_MAX_RPS,
+    resume: bool = False,
+) -> pd.DataFrame:
+    print(f"➡️ Loading {spec.source.name}: {spec.source.path}")
+    df = read_interim(spec.source, columns=spec.input_columns)
+
+    # Persistent cache: lookups resolved by previous runs never hit the API
+    cache = EnrichmentCache()
+    # Local index of every track already resolved, queried before the API
+    matcher = MatchIndex.from_cache(cache)
+    # One client (one connection pool) + one rate limiter shared by every worker thread
+    client = SpotifyClient(
+        cache=cache,
+        rate_limiter=RateLimiter(max_rps),
+        pool_size=max(1, workers),
+        matcher=matcher,
+    )
+
+    rows = df[df["title"].notna() & df["artist"].notna()]
+
+    # ---------- DEDUP: ENRICH DISTINCT TRACKS, NOT ROWS ---------- #
+    tracks = distinct_tracks(rows, spec.keys)
+
+    print(
+        f"🎧 Starting Spotify enrichment for {len(df)} {spec.unit} "
+        f"({len(tracks)} distinct tracks, {workers} workers)..."
+    )
+
+    # ---------- ENRICH IN CHECKPOINTED CHUNKS ---------- #
+    checkpoint = EnrichmentCheckpoint(spec.output.name)
+    results = enrich_in_chunks(
+        tracks,
+        lambda chunk: enrich_tracks(client, chunk, workers),
+        checkpoint,
+        resume=resume,
+    )
+    if not len(results):
+        # Nothing enriched (e.g. no new plays): an empty frame with the key dtypes
+        results = tracks.reindex(columns=spec.keys + SPOTIFY_COLUMNS)
+    matched = results[results["spotify_track_id"].notna()]
+
+    # ---------- JOIN BACK ONTO EVERY ROW (VECTORIZED) ---------- #
+    extraction_date = datetime.utcnow().date().isoformat()
+
+    # Every source row, unmatched ones included (null Spotify columns)
+    df_all = join_back(df, matched.reindex(columns=spec.keys + SPOTIFY_COLUMNS), spec.keys, how="left")
+    df_all = df_all.rename(columns=spec.renames).assign(extraction_date=extraction_date)
+
+    # ---------- DQ GATE ON EVERY ROW, THEN SAVE THE MATCHED ONES ---------- #
+    # Gated before unmatched rows are dropped, so max_missing_pct on
+    # spotify_track_id is the share of rows with no match. A breach keeps
+    # the checkpoint, so the run can be resumed once fixed. An empty input
+    # (an incremental run with no new plays) is not held to min_rows: the
+    # full load checks it again on the file before replacing a table.
+    gate = DQGate(spec.output, "enrich", check_min_rows=len(df) > 0)
+    gate.update(to_arrow(df_all, spec.output))
+    gate.check()
+
+    df_out = df_all[df_all["spotify_track_id"].notna()].reset_index(drop=True)
+    write_interim(df_out, spec.output)
+    checkpoint.clear()
+
+    print(f"✅ Spotify enrichment complete → {spec.output.path}")
+    print(f"📊 Total enriched {spec.unit}: {len(df_out)} ({len(matched)}/{len(tracks)} tracks matched)")
+    print(f"💾 Persistent cache: {cache.hits} hits / {cache.misses} misses")
+    print(f"🧭 Matching index: {matcher.hits} lookups served locally ({len(matcher)} entries)")
+    print(f"⏳ Rate-limit pauses: {client.rate_limiter.pauses}")
+    client.close()
+    cache.close()
+
+    return df_out
+
+
+def add_arguments(parser):
+    """CLI options shared by the enrichment entrypoints."""
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Concurrent Spotify requests (1 = sequential).")
+    parser.add_argument("--max-rps", type=float, default=DEFAULT_MAX_RPS,
+                        help="Global cap on Spotify requests per second.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoint.")
+    return parser
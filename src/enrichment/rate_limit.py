@@ -0,0 +1,57 @@
+# src/enrichment/rate_limit.py
+"""
+Global rate limiting for concurrent Spotify calls.
+
+One RateLimiter is shared by every worker thread of a run:
+- a token bucket caps the request rate (with a small burst allowance)
+- a 429 response pauses *all* workers until Retry-After has elapsed,
+  instead of each thread backing off on its own and hammering the API
+"""
+import threading
+import time
+
+DEFAULT_MAX_RPS = 15.0
+
+
+class RateLimiter:
+    """Thread-safe token bucket with a shared pause on 429."""
+
+    def __init__(self, rate: float = DEFAULT_MAX_RPS, burst: int | None = None):
+        self.rate = rate                      # requests per second
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.pauses = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    elapsed = now - self.updated_at
+                    self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                    self.updated_at = now
+
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every worker back for `seconds` (e.g. on 429 Retry-After)."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self.paused_until:
+                self.paused_until = resume_at
+                self.pauses += 1
+            # Start again from an empty bucket to avoid a burst after the pause
+            self.tokens = 0.0
+            self.updated_at = max(self.updated_at, resume_at)
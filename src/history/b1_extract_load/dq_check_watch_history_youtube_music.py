@@ -1,6 +1,9 @@
 import pandas as pd
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime
+
+from src.common.interim import WATCH_HISTORY
+from src.dq.engine import COUNT, FutureCount, GroupCounts, MissingCount, RowCount, evaluate
 
 # ============================================================
 # PATHS
@@ -8,13 +11,7 @@ from datetime import datetime, timezone
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
-INPUT_FILE = (
-    PROJECT_ROOT
-    / "data"
-    / "interim"
-    / "history"
-    / "watch_history_youtube_music.csv"
-)
+INPUT_FILE = WATCH_HISTORY.path
 
 DQ_LOG_DIR = PROJECT_ROOT / "data" / "processed" / "dq"
 DQ_LOG_FILE = DQ_LOG_DIR / f"dq_watch_history_{datetime.utcnow().date().isoformat()}.csv"
@@ -22,6 +19,23 @@ DQ_LOG_FILE = DQ_LOG_DIR / f"dq_watch_history_{datetime.utcnow().date().isoforma
 ANALYSIS_DIR = PROJECT_ROOT / "data" / "processed" / "analysis"
 REPLAYED_TRACKS_FILE = ANALYSIS_DIR / "tracks_played_multiple_times.csv"
 
+# ============================================================
+# RULES (evaluated together, in one pass over the file)
+# ============================================================
+
+RULES = [
+    RowCount(),
+    MissingCount("track_id"),
+    MissingCount("title"),
+    MissingCount("artist"),
+    MissingCount("played_at"),
+    # played_at is stored as a UTC timestamp; values that could not be
+    # parsed at extraction time are null
+    MissingCount("played_at", name="invalid_played_at_format"),
+    FutureCount("played_at"),
+    GroupCounts("plays_per_track", ("track_id", "source")),
+]
+
 # ============================================================
 # MAIN
 # ============================================================
@@ -29,67 +43,19 @@ REPLAYED_TRACKS_FILE = ANALYSIS_DIR / "tracks_played_multiple_times.csv"
 def run_checks_and_analysis():
     print(f"➡️ Running DQ & usage analysis on {INPUT_FILE}")
 
-    df = pd.read_csv(INPUT_FILE)
-
-    dq_results = []
-
     # ========================================================
     # BASIC DQ CHECKS
     # ========================================================
 
-    dq_results.append({
-        "check": "row_count",
-        "value": len(df)
-    })
-
-    dq_results.append({
-        "check": "missing_track_id",
-        "value": df["track_id"].isna().sum()
-    })
-
-    dq_results.append({
-        "check": "missing_title",
-        "value": df["title"].isna().sum()
-    })
-
-    dq_results.append({
-        "check": "missing_artist",
-        "value": df["artist"].isna().sum()
-    })
-
-    dq_results.append({
-        "check": "missing_played_at",
-        "value": df["played_at"].isna().sum()
-    })
-
-    # played_at parsing
-    played_at_parsed = pd.to_datetime(
-        df["played_at"],
-        errors="coerce",
-        utc=True
-    )
-
-    dq_results.append({
-        "check": "invalid_played_at_format",
-        "value": played_at_parsed.isna().sum()
-    })
-
-    now_utc = datetime.now(timezone.utc)
-    dq_results.append({
-        "check": "future_plays",
-        "value": (played_at_parsed > now_utc).sum()
-    })
+    result = evaluate(RULES, INPUT_FILE)
+    dq_results = result.checks()
 
     # ========================================================
     # USAGE ANALYTICS — REPLAYS (THIS IS WHAT YOU WANT)
     # ========================================================
 
-    plays_per_track = (
-        df
-        .groupby(["track_id", "source"], dropna=False)
-        .size()
-        .reset_index(name="play_count")
-    )
+    # One row per (track, source): small, whatever the history size
+    plays_per_track = result["plays_per_track"].to_pandas().rename(columns={COUNT: "play_count"})
 
     tracks_played_multiple_times = plays_per_track.query("play_count > 1")
 
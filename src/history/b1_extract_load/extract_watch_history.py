@@ -1,37 +1,48 @@
+import argparse
+import codecs
 import json
+import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
+from src.common.fingerprint import event_fingerprint, listening_ids_at, video_digest
+from src.common.interim import WATCH_HISTORY, InterimWriter
+from src.common.parallel import ingest_shards
+from src.common.takeout import WATCH_HISTORY_MEMBER, TakeoutMember, export_members
+from src.config.paths import RAW_TAKEOUT_ARCHIVES_DIR, WATCH_HISTORY_JSON
+from src.common.state import MarkTracker, StateStore, parse_played_at
+from src.dq.gates import DQGate
+
 # ============================================================
 # PATHS
 # ============================================================
 
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
-
-WATCH_HISTORY_FILE = (
-    PROJECT_ROOT
-    / "data"
-    / "raw"
-    / "takeout"
-    / "youtube_music"
-    / "history"
-    / "watch-history.json"
-)
-
-OUTPUT_FILE = (
-    PROJECT_ROOT
-    / "data"
-    / "interim"
-    / "history"
-    / "watch_history_youtube_music.csv"
-)
+WATCH_HISTORY_FILE = WATCH_HISTORY_JSON
+
+OUTPUT_FILE = WATCH_HISTORY.path
+
+# ============================================================
+# STREAMING SETTINGS
+# ============================================================
+
+READ_SIZE = 1 << 20      # bytes read from the JSON file per refill
+CHUNK_ROWS = 50_000      # rows buffered before each row-group write
+SHARD_BYTES = 64 << 20   # byte range parsed by one worker (--workers > 1)
+
+OUTPUT_COLUMNS = WATCH_HISTORY.columns
 
 # ============================================================
 # HELPERS
 # ============================================================
 
+_TOPIC_SUFFIX = re.compile(r"\s*-\s*Topic\s*$")
+
+
 def extract_video_id(url: str) -> str | None:
     """Extract YouTube video ID from a YouTube Music URL."""
     if not url:
@@ -56,7 +67,6 @@ def clean_title(title: str | None) -> str | None:
 
     return title
 
-import re
 
 def clean_artist(artist: str | None) -> str | None:
     """
@@ -68,9 +78,7 @@ def clean_artist(artist: str | None) -> str | None:
         return artist
 
     artist = artist.strip()
-    return re.sub(r"\s*-\s*Topic\s*$", "", artist)
-
-
+    return _TOPIC_SUFFIX.sub("", artist)
 
 
 def extract_artist(event: dict) -> str | None:
@@ -85,53 +93,403 @@ def extract_artist(event: dict) -> str | None:
 
 
 # ============================================================
-# EXTRACTION
+# COLUMNAR TRANSFORM
 # ============================================================
+# Vectorized equivalents of the per-row helpers above, applied to a whole
+# chunk of events at once. Each column is loaded into an Arrow array and
+# dictionary-encoded (a track or artist repeats thousands of times in a
+# history), so the string work runs once per distinct value and is expanded
+# back with a single take(). They must return exactly what the per-row
+# helpers return (see benchmarks/bench_history_normalization.py).
+
+# urlsplit() cuts the fragment before looking for '?'
+_URL_QUERY = re.compile(r"^[^#?]*\?([^#]*)")
+# parse_qs() skips blank values, so take the first non-empty v=
+_QUERY_VIDEO_ID = re.compile(r"(?:^|&)v=([^&]+)")
+# Inputs parse_qs/urlsplit would rewrite (percent-encoding, '+', stripped
+# control characters) go through the per-row helper instead
+_URL_NEEDS_ROW_PATH = re.compile(r"[%+\t\r\n]")
+
+
+def _restore_non_strings(result: pd.Series, original: pd.Series) -> pd.Series:
+    """Keep non-string inputs untouched, like the per-row helpers do."""
+    return result.where(result.notna(), original).astype(object)
 
-def extract_watch_history_youtube_music():
-    print("➡️ Loading watch-history.json...")
 
-    with open(WATCH_HISTORY_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def _arrow_column(array: pa.Array) -> pd.Series:
+    return pd.Series(pd.arrays.ArrowExtensionArray(array))
 
-    rows = []
 
-    for event in data:
-        # Keep only YouTube Music events
-        if event.get("header") != "YouTube Music":
-            continue
+def _per_distinct_value(values: list, transform) -> pd.Series:
+    """Run a column transform on the distinct values only, then expand."""
+    try:
+        encoded = pc.dictionary_encode(pa.array(values, type=pa.string()))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Non-string values in the column: transform it as-is
+        return transform(pd.Series(values, dtype=object))
 
-        # NOTE: Google Takeout prefixes titles with 'Watched ' in watch history
-        raw_title = event.get("title")
-        title = clean_title(raw_title)
+    uniques = pd.Series(encoded.dictionary.to_pylist(), dtype=object)
+    dictionary = pa.array(transform(uniques).tolist(), type=pa.string())
+    return _arrow_column(dictionary.take(encoded.indices))
 
-        url = event.get("titleUrl")
-        video_id = extract_video_id(url)
 
-        raw_artist = extract_artist(event)
-        artist = clean_artist(raw_artist)
+def _extract_video_ids(urls: pd.Series) -> pd.Series:
+    query = urls.str.extract(_URL_QUERY, expand=False)
+    video_ids = query.str.extract(_QUERY_VIDEO_ID, expand=False).astype(object)
+
+    row_path = urls.str.contains(_URL_NEEDS_ROW_PATH, na=False)
+    if row_path.any():
+        video_ids[row_path] = urls[row_path].map(extract_video_id)
+
+    return video_ids.where(video_ids.notna(), None)
+
+
+def _clean_titles(titles: pd.Series) -> pd.Series:
+    return _restore_non_strings(titles.str.removeprefix("Watched "), titles)
+
+
+def _clean_artists(artists: pd.Series) -> pd.Series:
+    cleaned = artists.str.strip().str.replace(_TOPIC_SUFFIX, "", regex=True)
+    return _restore_non_strings(cleaned, artists)
+
+
+def extract_video_ids(urls: list) -> pd.Series:
+    """Vectorized extract_video_id()."""
+    return _per_distinct_value(urls, _extract_video_ids)
+
+
+def clean_titles(titles: list) -> pd.Series:
+    """Vectorized clean_title()."""
+    return _per_distinct_value(titles, _clean_titles)
+
+
+def clean_artists(artists: list) -> pd.Series:
+    """Vectorized clean_artist()."""
+    return _per_distinct_value(artists, _clean_artists)
+
+
+def listening_ids(video_ids: pd.Series, times: pd.Series) -> pd.Series:
+    """
+    Vectorized listening_id(): the Takeout timestamps are parsed once,
+    column-wise, to UTC microseconds (null where a time is missing or invalid),
+    and only the distinct video IDs are hashed.
+    """
+    played_at = pd.to_datetime(pd.Series(times), utc=True, errors="coerce", format="ISO8601")
+    missing = played_at.isna().to_numpy()
+    micros = played_at.dt.as_unit("us").array.asi8
 
+    codes, uniques = pd.factorize(video_ids, use_na_sentinel=False)
+    digests = np.array(
+        [video_digest(video_id if isinstance(video_id, str) else None) for video_id in uniques],
+        dtype=np.uint64,
+    )
 
-        rows.append({
-            "track_id": video_id,
-            "title": title,
-            "artist": artist,
-            "album": None,               # Not available in watch history
-            "duration_seconds": None,
-            "liked": None,
-            "ytm_url": url,
-            "source": "watch_history",
-            "played_at": event.get("time"),
-            "extraction_date": datetime.utcnow().date().isoformat(),
-        })
+    return pd.Series(pd.arrays.IntegerArray(listening_ids_at(digests[codes], micros), missing))
 
-    df = pd.DataFrame(rows)
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUTPUT_FILE, index=False)
+def normalize_events(raw: dict, extraction_date: str) -> pd.DataFrame:
+    """
+    Build the output rows for a chunk of YouTube Music events.
+
+    `raw` holds one list per raw field (title, titleUrl, artist, time),
+    as collected by the streaming parser.
+    """
+    video_ids = extract_video_ids(raw["titleUrl"])
+    times = _arrow_column(pa.array(raw["time"], type=pa.string()))
+
+    return pd.DataFrame({
+        "listening_id": listening_ids(video_ids, times),
+        "track_id": video_ids,
+        "title": clean_titles(raw["title"]),
+        "artist": clean_artists(raw["artist"]),
+        "album": None,               # Not available in watch history
+        "duration_seconds": None,
+        "liked": None,
+        "ytm_url": _arrow_column(pa.array(raw["titleUrl"], type=pa.string())),
+        "source": "watch_history",
+        "played_at": times,
+        "extraction_date": extraction_date,
+    }, columns=OUTPUT_COLUMNS)
+
+
+# ============================================================
+# STREAMING PARSER
+# ============================================================
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+# Start of a top-level event: events open with their "header" key, nested
+# objects (subtitles, details) never do
+_EVENT_START = re.compile(rb'\}\s*,\s*(\{\s*"header"\s*:)')
+
+
+class _ArraySlice:
+    """
+    Text reader over the bytes [start, end) of a JSON array stream (to the
+    end if `end` is None), decoded incrementally. A slice cut between two
+    events is read as an array of its own: '[' / ']' are added where the
+    cut removed them.
+
+    A read can return "" before the end (bytes ending inside a multibyte
+    character), so the end of the slice is `eof`, not an empty read.
+    """
+
+    def __init__(self, f, start: int = 0, end: int | None = None):
+        if start:
+            f.seek(start)
+        self._f = f
+        self._left = None if end is None else end - start
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._prefix = "[" if start > 0 else ""
+        self._suffix = "]" if end is not None else ""
+        self.eof = False
+
+    def read(self, size: int) -> str:
+        if self._left is not None:
+            size = min(size, self._left)
+            data = self._f.read(size)
+            self._left -= len(data)
+            done = not self._left
+        else:
+            data = self._f.read(size)
+            done = not data
+
+        text = self._prefix + self._decoder.decode(data, final=done)
+        self._prefix = ""
+
+        if done:
+            text += self._suffix
+            self._suffix = ""
+            self.eof = True
+        return text
+
+
+def iter_watch_history_events(source, read_size: int = READ_SIZE, start: int = 0, end: int | None = None):
+    """
+    Yield the events of a Takeout watch-history.json one by one.
+
+    `source` is a Path or a TakeoutMember (streamed out of its archive).
+
+    The file is a single top-level JSON array; it is read in fixed-size
+    slices and each element is decoded as soon as it is complete, so only
+    the current slice and the current event are held in memory. `start` /
+    `end` restrict the read to a byte range cut at event boundaries (see
+    event_ranges()).
+    """
+    decoder = json.JSONDecoder()
+
+    with source.open("rb") as raw:
+        f = _ArraySlice(raw, start, end)
+
+        buf = ""
+        while not buf and not f.eof:
+            buf = f.read(read_size).lstrip()
+
+        if not buf:
+            return
+        if buf[0] != "[":
+            raise ValueError(f"{source} is not a JSON array")
+        pos = 1
+
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            if pos == len(buf) and f.eof:
+                raise ValueError(f"{source} ended before the closing ']'")
+
+            # Only trust a decoded element if the buffer continues after it
+            # (or the file is exhausted), otherwise read more and retry.
+            try:
+                event, end_pos = decoder.raw_decode(buf, pos)
+                complete = end_pos < len(buf) or f.eof
+            except json.JSONDecodeError:
+                if f.eof:
+                    raise
+                complete = False
+
+            if complete:
+                yield event
+                pos = end_pos
+                continue
+
+            buf = buf[pos:] + f.read(read_size)
+            pos = 0
+
+
+def _next_event_start(f, offset: int, size: int) -> int:
+    """Byte offset of the first event starting after `offset` (`size` if none)."""
+    f.seek(offset)
+    base, window = offset, b""
+
+    while True:
+        chunk = f.read(READ_SIZE)
+        window += chunk
+        match = _EVENT_START.search(window)
+        if match:
+            return base + match.start(1)
+        if not chunk:
+            return size
+
+        # Keep a tail long enough for a match straddling two reads
+        tail = min(len(window), 256)
+        base += len(window) - tail
+        window = window[len(window) - tail:]
+
+
+def event_ranges(source, shard_bytes: int = SHARD_BYTES) -> list[tuple]:
+    """
+    Cut a watch-history file into (source, start, end) byte ranges of about
+    `shard_bytes`, each starting at an event (end None: to the end).
+
+    Cuts land right before a '{"header":' that follows a '},': a quote
+    inside a JSON string is always escaped, so this never matches within a
+    title or URL, and only top-level events have a "header" key. An archive
+    member is a single range, as a compressed stream cannot be entered midway.
+    """
+    if isinstance(source, TakeoutMember):
+        return [(source, 0, None)]
+
+    path = source
+    size = path.stat().st_size
+    bounds = [0]
+
+    with open(path, "rb") as f:
+        for offset in range(shard_bytes, size, shard_bytes):
+            start = _next_event_start(f, max(offset, bounds[-1]), size)
+            if start >= size:
+                break
+            if start > bounds[-1]:
+                bounds.append(start)
+
+    return [(path, start, end) for start, end in zip(bounds, [*bounds[1:], None])]
+
+
+def _new_raw_chunk() -> dict:
+    return {"title": [], "titleUrl": [], "artist": [], "time": []}
+
+
+# ============================================================
+# EXTRACTION
+# ============================================================
 
-    print(f"✅ Saved watch history → {OUTPUT_FILE}")
-    print(f"📊 Total YouTube Music plays: {len(df)}")
+def _extract_events(
+    ranges: list[tuple],
+    writer: InterimWriter,
+    extraction_date: str,
+    chunk_rows: int,
+    previous=None,
+    tracker: MarkTracker | None = None,
+) -> int:
+    """Write the YouTube Music plays of `ranges` to `writer`; returns the plays skipped."""
+    skipped = 0
+    raw = _new_raw_chunk()
+
+    for source, start, end in ranges:
+        for event in iter_watch_history_events(source, start=start, end=end):
+            # Keep only YouTube Music events
+            if event.get("header") != "YouTube Music":
+                continue
+
+            if tracker is not None and event.get("time"):
+                played_at = parse_played_at(event["time"])
+                fingerprint = event_fingerprint(event.get("titleUrl"), event["time"])
+                tracker.add(played_at, fingerprint)
+
+                if previous and not previous.is_new(played_at, fingerprint):
+                    skipped += 1
+                    continue
+
+            # NOTE: Google Takeout prefixes titles with 'Watched ' in watch history;
+            # cleaning happens column-wise in normalize_events()
+            raw["title"].append(event.get("title"))
+            raw["titleUrl"].append(event.get("titleUrl"))
+            raw["artist"].append(extract_artist(event))
+            raw["time"].append(event.get("time"))
+
+            # Flush in bounded chunks so memory does not grow with the input
+            if len(raw["time"]) >= chunk_rows:
+                writer.write(normalize_events(raw, extraction_date))
+                raw = _new_raw_chunk()
+
+    if raw["time"]:
+        writer.write(normalize_events(raw, extraction_date))
+
+    return skipped
+
+
+def _extract_shard(shard, part_path: Path, extraction_date: str, chunk_rows: int, previous, incremental: bool):
+    """Worker: one byte range to a part file; returns its mark tracker and skipped plays."""
+    tracker = MarkTracker() if incremental else None
+    with InterimWriter(WATCH_HISTORY, part_path) as writer:
+        skipped = _extract_events([shard], writer, extraction_date, chunk_rows, previous, tracker)
+    return tracker, skipped
+
+
+def extract_watch_history_youtube_music(
+    input_files: Path | TakeoutMember | list = WATCH_HISTORY_FILE,
+    output_file: Path = OUTPUT_FILE,
+    chunk_rows: int = CHUNK_ROWS,
+    incremental: bool = False,
+    state: StateStore | None = None,
+    workers: int = 1,
+    takeout: Path | None = None,
+):
+    if takeout is not None:
+        # Straight from the Takeout archives (a directory or one part)
+        input_files = export_members(WATCH_HISTORY_MEMBER, takeout)
+    input_files = [input_files] if isinstance(input_files, (Path, TakeoutMember)) else list(input_files)
+    names = [source.name if isinstance(source, Path) else str(source) for source in input_files]
+    print(f"➡️ Streaming {', '.join(names)}...")
+
+    extraction_date = datetime.utcnow().date().isoformat()
+
+    # Incremental: only keep events not covered by the committed mark
+    if incremental:
+        state = state or StateStore()
+        previous = state.committed()
+        tracker = MarkTracker()
+        if previous:
+            print(f"⏩ Incremental run since {previous.played_at.isoformat()}")
+        else:
+            print("⏩ Incremental run without a committed mark: full extraction")
+    else:
+        previous = tracker = None
+
+    # Chunks are DQ-checked as they are written; a breach fails the run
+    # before the output (or the pending mark) is published
+    gate = DQGate(WATCH_HISTORY, "extract")
+
+    with InterimWriter(WATCH_HISTORY, output_file, gate=gate) as writer:
+        if workers > 1:
+            # ---------- BYTE RANGES ACROSS WORKER PROCESSES ---------- #
+            shards = [shard for source in input_files for shard in event_ranges(source)]
+            print(f"⚙️ {len(shards)} shards on {workers} workers")
+            results = ingest_shards(
+                _extract_shard, shards, writer, workers,
+                extraction_date, chunk_rows, previous, incremental,
+            )
+            skipped = sum(shard_skipped for _, shard_skipped in results)
+            if tracker is not None:
+                for shard_tracker, _ in results:
+                    tracker.update(shard_tracker)
+        else:
+            ranges = [(source, 0, None) for source in input_files]
+            skipped = _extract_events(ranges, writer, extraction_date, chunk_rows, previous, tracker)
+
+        if not writer.rows:
+            writer.write(normalize_events(_new_raw_chunk(), extraction_date))
+
+        total = writer.rows
+
+    print(f"✅ Saved watch history → {output_file}")
+    print(f"📊 Total YouTube Music plays: {total}")
+
+    if tracker is not None:
+        # Committed by the last load of the chain (see load_spotify_bq.py)
+        state.save_pending(tracker.mark(previous))
+        print(f"⏭️ Already loaded plays skipped: {skipped}")
 
 
 # ============================================================
@@ -139,4 +497,18 @@ def extract_watch_history_youtube_music():
 # ============================================================
 
 if __name__ == "__main__":
-    extract_watch_history_youtube_music()
+    parser = argparse.ArgumentParser(description="Extract YouTube Music plays from watch-history.json.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only extract plays newer than the committed high-water mark.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--input", nargs="+", type=Path, default=[WATCH_HISTORY_FILE], metavar="FILE",
+                        help="watch-history.json file(s), e.g. of several Takeout exports.")
+    source.add_argument("--takeout", nargs="?", type=Path, const=RAW_TAKEOUT_ARCHIVES_DIR, metavar="PATH",
+                        help="Read straight from the Takeout archives: a directory (newest export) or one part.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; each parses byte ranges of the input files.")
+    args = parser.parse_args()
+
+    extract_watch_history_youtube_music(
+        args.input, incremental=args.incremental, workers=args.workers, takeout=args.takeout,
+    )
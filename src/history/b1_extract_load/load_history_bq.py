@@ -1,75 +1,48 @@
-from google.cloud import bigquery
-from pathlib import Path
-import pandas as pd
+import argparse
+
+from src.common.interim import WATCH_HISTORY, row_count
+from src.dq.gates import check_file
+from src.warehouse.datasets import RAW_WATCH_HISTORY
+from src.warehouse.sinks import get_sink
 
 # ============================================================
 # PATHS
 # ============================================================
 
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
-
-INPUT_FILE = (
-    PROJECT_ROOT
-    / "data"
-    / "interim"
-    / "history"
-    / "watch_history_youtube_music.csv"
-)
-
-SERVICE_ACCOUNT = (
-    PROJECT_ROOT
-    / "secrets"
-    / "ytmusic-analytics-478417-692a6c5d2282.json"
-)
-
-TABLE_ID = "ytmusic-analytics-478417.ytmusic_raw.raw_watch_history_youtube_music"
+INPUT_FILE = WATCH_HISTORY.path
 
 # ============================================================
-# LOAD TO BIGQUERY
+# LOAD TO THE WAREHOUSE (BigQuery, or DuckDB with YT_WAREHOUSE=duckdb)
 # ============================================================
 
-def load_to_bigquery():
+def load_to_bigquery(incremental: bool = False, sink=None):
     print(f"➡️ Loading watch history file: {INPUT_FILE}")
 
-    # --------------------------------------------------------
-    # Load CSV
-    # --------------------------------------------------------
-    df = pd.read_csv(INPUT_FILE)
+    if incremental and row_count(WATCH_HISTORY) == 0:
+        print("✅ No new plays to load")
+        return None
 
-    # --------------------------------------------------------
-    # BigQuery client
-    # --------------------------------------------------------
-    client = bigquery.Client.from_service_account_json(
-        str(SERVICE_ACCOUNT)
-    )
-
-    # --------------------------------------------------------
-    # Load configuration
-    # --------------------------------------------------------
-    job_config = bigquery.LoadJobConfig(
-        write_disposition="WRITE_TRUNCATE",
-        source_format=bigquery.SourceFormat.CSV,
-        autodetect=True,               # OK for raw layer
-        skip_leading_rows=1,
-    )
+    # Fail before any upload if the file breaches its DQ thresholds
+    check_file(WATCH_HISTORY, "load", INPUT_FILE)
 
     # --------------------------------------------------------
-    # Load job (EU location enforced)
+    # The typed interim Parquet file is loaded as-is. A full load
+    # replaces the table, an incremental load merges new plays
     # --------------------------------------------------------
-    job = client.load_table_from_dataframe(
-        df,
-        TABLE_ID,
-        job_config=job_config,
-        location="EU"
-    )
-
-    job.result()  # Wait for completion
+    sink = sink or get_sink()
+    stats = sink.load(RAW_WATCH_HISTORY, INPUT_FILE, incremental=incremental)
 
-    print(f"✅ Loaded {len(df)} rows into {TABLE_ID}")
+    print(f"✅ Loaded {stats}")
+    return stats
 
 # ============================================================
 # ENTRYPOINT
 # ============================================================
 
 if __name__ == "__main__":
-    load_to_bigquery()
+    parser = argparse.ArgumentParser(description="Load the watch history into the warehouse.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Merge the extracted plays into the raw table instead of replacing it.")
+    args = parser.parse_args()
+
+    load_to_bigquery(incremental=args.incremental)
@@ -1,64 +1,55 @@
-from google.cloud import bigquery
-from pathlib import Path
-import pandas as pd
+import argparse
 
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
+from src.common.interim import SPOTIFY_ENRICHED_HISTORY, row_count
+from src.common.state import StateStore
+from src.dq.gates import check_file
+from src.warehouse.datasets import RAW_SPOTIFY_HISTORY
+from src.warehouse.sinks import get_sink
 
-INPUT_FILE = PROJECT_ROOT / "data" / "interim" / "history" / "spotify_enriched_history.csv"
-SERVICE_ACCOUNT = PROJECT_ROOT / "secrets" / "ytmusic-analytics-478417-692a6c5d2282.json"
-TABLE_ID = "ytmusic-analytics-478417.ytmusic_raw.raw_spotify_history"
+INPUT_FILE = SPOTIFY_ENRICHED_HISTORY.path
 
 
-def load_spotify_enrichment():
-    print(f"➡️ Loading enriched Spotify file: {INPUT_FILE}")
-
-    df = pd.read_csv(INPUT_FILE)
-
-    # FIXES
-    df["release_year"] = df["release_year"].astype(str)
-    df["extraction_date"] = pd.to_datetime(df["extraction_date"]).dt.date
-
-    # BigQuery client
-    client = bigquery.Client.from_service_account_json(str(SERVICE_ACCOUNT))
+def commit_mark(state: StateStore | None = None):
+    """The extracted plays are in both raw tables: the next run can start from this mark."""
+    mark = (state or StateStore()).commit()
+    if mark:
+        print(f"🔖 High-water mark committed: {mark.played_at.isoformat()}")
+    return mark
 
-    job_config = bigquery.LoadJobConfig(
-        write_disposition="WRITE_TRUNCATE",
-        autodetect=False,
-        schema=[
-            bigquery.SchemaField("source_track_id", "STRING"),
-            bigquery.SchemaField("source_played_at", "STRING"),
-            bigquery.SchemaField("title_original", "STRING"),
-            bigquery.SchemaField("artist_original", "STRING"),
-            bigquery.SchemaField("album_original", "STRING"),
-            bigquery.SchemaField("source", "STRING"),
 
-            bigquery.SchemaField("spotify_track_id", "STRING"),
-            bigquery.SchemaField("spotify_artist_id", "STRING"),
-            bigquery.SchemaField("spotify_album_id", "STRING"),
-            bigquery.SchemaField("release_year", "STRING"),
-
-            bigquery.SchemaField("duration_ms", "INTEGER"),
-            bigquery.SchemaField("duration_seconds", "FLOAT"),
-            bigquery.SchemaField("popularity", "INTEGER"),
-            bigquery.SchemaField("explicit", "BOOLEAN"),
-            bigquery.SchemaField("genres", "STRING"),
+def load_spotify_enrichment(
+    incremental: bool = False,
+    state: StateStore | None = None,
+    sink=None,
+    commit: bool = True,
+):
+    print(f"➡️ Loading enriched Spotify file: {INPUT_FILE}")
+    stats = None
 
-            bigquery.SchemaField("extraction_date", "DATE"),
-        ],
-    )
+    if incremental and row_count(SPOTIFY_ENRICHED_HISTORY) == 0:
+        print("✅ No new enriched plays to load")
+    else:
+        # Fail before any upload if the file breaches its DQ thresholds
+        check_file(SPOTIFY_ENRICHED_HISTORY, "load", INPUT_FILE)
 
-    print("⬆️ Uploading to BigQuery…")
+        print("⬆️ Uploading to the warehouse…")
+        # Interim Parquet is already typed: loaded as-is, with its schema
+        sink = sink or get_sink()
+        stats = sink.load(RAW_SPOTIFY_HISTORY, INPUT_FILE, incremental=incremental)
+        print(f"✅ Loaded {stats}")
 
-    job = client.load_table_from_dataframe(
-        df,
-        TABLE_ID,
-        job_config=job_config,
-        location="EU"
-    )
-    job.result()
+    if incremental and commit:
+        # Last load of the history chain (run by hand): commit the mark.
+        # The load orchestrator commits it itself, once both history loads are done
+        commit_mark(state)
 
-    print(f"✅ Loaded {len(df)} rows into {TABLE_ID}")
+    return stats
 
 
 if __name__ == "__main__":
-    load_spotify_enrichment()
+    parser = argparse.ArgumentParser(description="Load the Spotify-enriched history into the warehouse.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Merge into the raw table and commit the high-water mark.")
+    args = parser.parse_args()
+
+    load_spotify_enrichment(incremental=args.incremental)
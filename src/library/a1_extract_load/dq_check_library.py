@@ -2,46 +2,28 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from src.common.interim import LIBRARY_CLEAN
+from src.dq.engine import DuplicateCount, MissingCount, RowCount, evaluate
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
-INPUT_FILE = PROJECT_ROOT / "data" / "interim" / "library_clean.csv"
+INPUT_FILE = LIBRARY_CLEAN.path
 LOG_DIR = PROJECT_ROOT / "data" / "processed" / "dq"
 LOG_FILE = LOG_DIR / f"dq_log_{datetime.utcnow().date().isoformat()}.csv"
 
+# Evaluated together, in one pass over the file
+RULES = [
+    RowCount(),
+    MissingCount("artist"),
+    MissingCount("album"),
+    DuplicateCount("duplicate_track_source", ("track_id", "source")),
+]
+
 
 def run_dq_checks():
     print(f"➡️ Running data quality checks on {INPUT_FILE}")
 
-    df = pd.read_csv(INPUT_FILE)
-
-    dq_results = []
-
-    # 1. Count total rows
-    dq_results.append({
-        "check": "row_count",
-        "value": len(df)
-    })
-
-    # 2. Missing artist
-    missing_artist = df["artist"].isna().sum()
-    dq_results.append({
-        "check": "missing_artist",
-        "value": missing_artist
-    })
-
-    # 3. Missing album
-    missing_album = df["album"].isna().sum()
-    dq_results.append({
-        "check": "missing_album",
-        "value": missing_album
-    })
-
-    # 4. Duplicate (track_id + source)
-    duplicates = df.duplicated(subset=["track_id", "source"]).sum()
-    dq_results.append({
-        "check": "duplicate_track_source",
-        "value": duplicates
-    })
+    dq_results = evaluate(RULES, INPUT_FILE).checks()
 
     # Save log
     LOG_DIR.mkdir(parents=True, exist_ok=True)
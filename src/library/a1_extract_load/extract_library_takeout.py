@@ -1,32 +1,62 @@
+import argparse
+import io
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
 
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
+from src.common.interim import LIBRARY_CLEAN, InterimWriter, write_interim
+from src.common.parallel import ingest_shards, split_evenly
+from src.common.takeout import (
+    LIBRARY_SONGS_MEMBER,
+    PLAYLISTS_MEMBERS,
+    TakeoutMember,
+    export_parts,
+    find_member,
+    find_members,
+    list_members,
+    read_bytes,
+)
+from src.config.paths import (
+    LIBRARY_SONGS_CSV,
+    PLAYLISTS_ALLOWLIST_JSON,
+    RAW_TAKEOUT_ARCHIVES_DIR,
+    RAW_TAKEOUT_PLAYLISTS_DIR,
+)
+from src.dq.gates import DQGate
 
-LIBRARY_FILE = PROJECT_ROOT / "data" / "raw" / "takeout" / "youtube_music" / "music (library and uploads)" / "music library songs.csv"
-PLAYLISTS_DIR = PROJECT_ROOT / "data" / "raw" / "takeout" / "youtube_music" / "playlists"
+LIBRARY_FILE = LIBRARY_SONGS_CSV
+PLAYLISTS_DIR = RAW_TAKEOUT_PLAYLISTS_DIR
 
 
-ALLOWLIST_FILE = PROJECT_ROOT / "src" / "config" / "playlists_allowlist.json"
-OUTPUT_FILE = PROJECT_ROOT / "data" / "interim" / "library" / "library_clean.csv"
+ALLOWLIST_FILE = PLAYLISTS_ALLOWLIST_JSON
+OUTPUT_FILE = LIBRARY_CLEAN.path
 
 
-def load_main_library():
-    df = pd.read_csv(LIBRARY_FILE)
+YTM_WATCH_URL = "https://music.youtube.com/watch?v="
+LIBRARY_COLUMNS = ["Song Title", "Artist Name 1", "Album Title"]   # metadata looked up by Video ID
+READ_WORKERS = 8
+SHARDS_PER_WORKER = 4    # playlist groups per worker process (--workers > 1)
 
-    df["artist"] = df["Artist Name 1"]
-    df["ytm_url"] = df["Video ID"].apply(lambda x: f"https://music.youtube.com/watch?v={x}")
+
+def ytm_urls(video_ids: pd.Series) -> pd.Series:
+    """YouTube Music URLs of a column of video IDs (null where the ID is missing)."""
+    return YTM_WATCH_URL + video_ids.astype("string")
+
+
+def load_main_library(library_file: Path | TakeoutMember = LIBRARY_FILE):
+    with library_file.open("rb") as f:     # a file, or streamed out of a Takeout archive
+        df = pd.read_csv(f)
 
     df_lib = pd.DataFrame({
         "track_id": df["Video ID"],
         "title": df["Song Title"],
-        "artist": df["artist"],
+        "artist": df["Artist Name 1"],
         "album": df["Album Title"],
         "duration_seconds": None,
         "liked": None,
-        "ytm_url": df["ytm_url"],
+        "ytm_url": ytm_urls(df["Video ID"]),
         "source": "library",
         "extraction_date": datetime.utcnow().date().isoformat(),
     })
@@ -34,68 +64,136 @@ def load_main_library():
     return df_lib, df  # df = raw library used for lookups
 
 
-def extract_playlists(df_raw_library, allowed):
-    rows = []
+def library_index(df_raw_library: pd.DataFrame) -> pd.DataFrame:
+    """Library metadata indexed once by Video ID (first entry wins for a duplicated ID)."""
+    return (
+        df_raw_library.drop_duplicates("Video ID")
+        .set_index("Video ID")[LIBRARY_COLUMNS]
+    )
+
+
+def playlist_name(playlist_file: Path | TakeoutMember) -> str:
+    return playlist_file.stem.replace("-videos", "").strip()
+
 
-    for playlist_file in PLAYLISTS_DIR.glob("*.csv"):
-        playlist_name = playlist_file.stem.replace("-videos", "").strip()
+def _size(source: Path | TakeoutMember) -> int:
+    return source.size if isinstance(source, TakeoutMember) else source.stat().st_size
 
-        if playlist_name not in allowed:
-            print(f"   ⛔ Ignored playlist: {playlist_name}")
+
+def select_playlists(allowed, playlists: Path | list = PLAYLISTS_DIR) -> list:
+    """Allowlisted playlist CSVs of a directory, or of a list of files / archive members."""
+    allowed = set(allowed)
+    selected = []
+
+    candidates = sorted(playlists.glob("*.csv")) if isinstance(playlists, Path) else playlists
+    for playlist_file in candidates:
+        name = playlist_name(playlist_file)
+
+        if name not in allowed:
+            print(f"   ⛔ Ignored playlist: {name}")
             continue
 
-        print(f"   ✔ Loading playlist: {playlist_name}")
+        print(f"   ✔ Loading playlist: {name}")
+        selected.append(playlist_file)
 
-        df_pl = pd.read_csv(playlist_file)
+    return selected
 
-        # Only Video ID -> join with library to recover metadata
-        merged = df_pl.merge(
-            df_raw_library,
-            on="Video ID",
-            how="left"
-        )
 
-        merged["ytm_url"] = merged["Video ID"].apply(lambda x: f"https://music.youtube.com/watch?v={x}")
+def read_playlist(playlist_file: Path | TakeoutMember, content: bytes) -> pd.DataFrame:
+    df_pl = pd.read_csv(io.BytesIO(content), usecols=["Video ID"])
+    df_pl["source"] = f"playlist:{playlist_name(playlist_file)}"
+    return df_pl
 
-        merged_clean = pd.DataFrame({
-            "track_id": merged["Video ID"],
-            "title": merged["Song Title"],
-            "artist": merged["Artist Name 1"],
-            "album": merged["Album Title"],
-            "duration_seconds": None,
-            "liked": None,
-            "ytm_url": merged["ytm_url"],
-            "source": f"playlist:{playlist_name}",
-            "extraction_date": datetime.utcnow().date().isoformat(),
-        })
 
-        rows.append(merged_clean)
+def playlist_rows(playlist_files: list, index: pd.DataFrame) -> pd.DataFrame:
+    """Clean rows of `playlist_files`, their metadata looked up in the library `index`."""
+    # ---------- READ EVERY PLAYLIST AT ONCE, THEN ONE LOOKUP ---------- #
+    contents = read_bytes(playlist_files)      # one pass per Takeout archive
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        playlists = pd.concat(pool.map(read_playlist, playlist_files, contents), ignore_index=True)
 
-    if rows:
-        return pd.concat(rows, ignore_index=True)
-    else:
+    # Only Video ID -> join with library to recover metadata
+    merged = playlists.join(index, on="Video ID")
+
+    return pd.DataFrame({
+        "track_id": merged["Video ID"],
+        "title": merged["Song Title"],
+        "artist": merged["Artist Name 1"],
+        "album": merged["Album Title"],
+        "duration_seconds": None,
+        "liked": None,
+        "ytm_url": ytm_urls(merged["Video ID"]),
+        "source": merged["source"],
+        "extraction_date": datetime.utcnow().date().isoformat(),
+    })
+
+
+def extract_playlists(df_raw_library, allowed, playlists: Path | list = PLAYLISTS_DIR):
+    selected = select_playlists(allowed, playlists)
+
+    if not selected:
         return pd.DataFrame([])
 
+    return playlist_rows(selected, library_index(df_raw_library))
 
-def extract_library_and_playlists():
-    print("➡️ Loading main library...")
-    df_library_clean, df_raw_lib = load_main_library()
 
+def _extract_playlist_shard(playlist_files: list, part_path: Path, index: pd.DataFrame):
+    """Worker: a group of playlists to a part file."""
+    with InterimWriter(LIBRARY_CLEAN, part_path) as writer:
+        writer.write(playlist_rows(playlist_files, index))
 
-    with open(ALLOWLIST_FILE, "r", encoding="utf-8") as f:
-        allowed = json.load(f)["allowed_playlists"]
 
-    print("➡️ Extracting whitelisted playlists...")
-    df_playlists = extract_playlists(df_raw_lib, allowed)
+def extract_library_and_playlists(
+    library_file: Path | TakeoutMember = LIBRARY_FILE,
+    playlists: Path | list = PLAYLISTS_DIR,
+    output_file: Path = OUTPUT_FILE,
+    allowed: list[str] | None = None,
+    workers: int = 1,
+    takeout: Path | None = None,
+):
+    if takeout is not None:
+        # Library and playlists straight out of the export's archive parts
+        members = list_members(export_parts(takeout))
+        library_file = find_member(members, LIBRARY_SONGS_MEMBER)
+        playlists = find_members(members, PLAYLISTS_MEMBERS)
+        print(f"🗜️ Reading {library_file} and {len(playlists)} playlist files from the Takeout archives")
+
+    print("➡️ Loading main library...")
+    df_library_clean, df_raw_lib = load_main_library(library_file)
 
-    df_all = pd.concat([df_library_clean, df_playlists], ignore_index=True)
+    if allowed is None:
+        with open(ALLOWLIST_FILE, "r", encoding="utf-8") as f:
+            allowed = json.load(f)["allowed_playlists"]
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    df_all.to_csv(OUTPUT_FILE, index=False)
+    print("➡️ Extracting whitelisted playlists...")
+    gate = DQGate(LIBRARY_CLEAN, "extract")
+
+    if workers > 1:
+        # ---------- PLAYLIST GROUPS ACROSS WORKER PROCESSES ---------- #
+        selected = select_playlists(allowed, playlists)
+        shards = split_evenly(selected, [_size(source) for source in selected], workers * SHARDS_PER_WORKER)
+        print(f"⚙️ {len(shards)} shards on {workers} workers")
+
+        with InterimWriter(LIBRARY_CLEAN, output_file, gate=gate) as writer:
+            writer.write(df_library_clean)
+            ingest_shards(_extract_playlist_shard, shards, writer, workers, library_index(df_raw_lib))
+            total = writer.rows
+    else:
+        df_playlists = extract_playlists(df_raw_lib, allowed, playlists)
+        df_all = pd.concat([df_library_clean, df_playlists], ignore_index=True)
+        write_interim(df_all, LIBRARY_CLEAN, output_file, gate=gate)
+        total = len(df_all)
 
-    print(f"✅ Saved merged clean library → {OUTPUT_FILE}")
-    print(f"📊 Total rows extracted: {len(df_all)}")
+    print(f"✅ Saved merged clean library → {output_file}")
+    print(f"📊 Total rows extracted: {total}")
 
 
 if __name__ == "__main__":
-    extract_library_and_playlists()
+    parser = argparse.ArgumentParser(description="Extract the YouTube Music library and allowlisted playlists.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; each reads a group of playlist files.")
+    parser.add_argument("--takeout", nargs="?", type=Path, const=RAW_TAKEOUT_ARCHIVES_DIR, metavar="PATH",
+                        help="Read straight from the Takeout archives: a directory (newest export) or one part.")
+    args = parser.parse_args()
+
+    extract_library_and_playlists(workers=args.workers, takeout=args.takeout)
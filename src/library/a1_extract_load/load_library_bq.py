@@ -1,41 +1,24 @@
-from google.cloud import bigquery
-from pathlib import Path
-import pandas as pd
+from src.common.interim import LIBRARY_CLEAN
+from src.dq.gates import check_file
+from src.warehouse.datasets import RAW_LIBRARY
+from src.warehouse.sinks import get_sink
 
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
-INPUT_FILE = PROJECT_ROOT / "data" / "interim" / "library_clean.csv"
+INPUT_FILE = LIBRARY_CLEAN.path
 
-SERVICE_ACCOUNT = PROJECT_ROOT / "secrets" / "ytmusic-analytics-478417-692a6c5d2282.json"
-TABLE_ID = "ytmusic-analytics-478417.ytmusic_raw.raw_library_test"
 
-
-def load_to_bigquery():
+def load_to_bigquery(sink=None):
     print(f"➡️ Loading cleaned file: {INPUT_FILE}")
 
-    # Load CSV
-    df = pd.read_csv(INPUT_FILE)
-
-    # BigQuery client
-    client = bigquery.Client.from_service_account_json(str(SERVICE_ACCOUNT))
-
-    # Load configuration
-    job_config = bigquery.LoadJobConfig(
-        autodetect=False,
-        write_disposition="WRITE_TRUNCATE",
-        source_format=bigquery.SourceFormat.CSV,
-        skip_leading_rows=1,
-    )
-
-    # Load to BigQuery with location enforced to EU
-    job = client.load_table_from_dataframe(
-        df,
-        TABLE_ID,
-        job_config=job_config,
-        location="EU"
-    )
-    job.result()  # Wait for job to complete
-
-    print(f"✅ Loaded {len(df)} rows into {TABLE_ID}")
+    # Fail before any upload if the file breaches its DQ thresholds
+    check_file(LIBRARY_CLEAN, "load", INPUT_FILE)
+
+    # Warehouse sink (BigQuery, or DuckDB with YT_WAREHOUSE=duckdb);
+    # the typed interim Parquet file is loaded as-is
+    sink = sink or get_sink()
+    stats = sink.load(RAW_LIBRARY, INPUT_FILE)
+
+    print(f"✅ Loaded {stats}")
+    return stats
 
 
 if __name__ == "__main__":
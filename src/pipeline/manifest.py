@@ -0,0 +1,142 @@
+# src/pipeline/manifest.py
+"""
+Content-hash manifest of pipeline runs.
+
+The manifest (data/state/pipeline_manifest.json) keeps:
+- the content digest of every file the runner has looked at, with the size
+  and mtime it had when hashed: a file whose stat is unchanged is not read
+  again, so checking a stage that has nothing to do only costs a stat() per
+  file
+- the `src.*` modules each Python file imports, so the code a stage runs
+  (its module and everything it imports from the project) is found without
+  importing it
+- per stage, the digests of its inputs and code, its parameters and the
+  digests of the outputs it wrote, as of its last successful run
+
+A stage is up to date when its inputs, code and parameters hash to the
+recorded key and its outputs still have the recorded digests.
+"""
+import ast
+import json
+from datetime import datetime, timezone
+from hashlib import blake2b
+from pathlib import Path
+
+from src.config.paths import PROJECT_ROOT, STATE_DIR
+
+MANIFEST_FILE = STATE_DIR / "pipeline_manifest.json"
+
+READ_SIZE = 1 << 20
+MISSING = "missing"
+
+
+def _relative(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+def _hash_file(path: Path) -> str:
+    digest = blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _module_path(module: str) -> Path | None:
+    """Source file of a project module ('src.common.interim'), if it exists."""
+    base = PROJECT_ROOT.joinpath(*module.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def _parse_imports(path: Path) -> list[str]:
+    """Project modules (`src.*`) imported by a Python file."""
+    modules = set()
+    for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            # `from src.common import takeout` imports a submodule
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+
+    return sorted(module for module in modules if module.split(".")[0] == "src" and _module_path(module))
+
+
+def stage_key(inputs: dict, code: dict, params: dict) -> str:
+    payload = json.dumps({"inputs": inputs, "code": code, "params": params}, sort_keys=True)
+    return blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Manifest:
+    def __init__(self, path: Path = MANIFEST_FILE):
+        self.path = path
+        data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self._files = data.get("files", {})
+        self._stages = data.get("stages", {})
+
+    # ---------- FILES ---------- #
+
+    def _entry(self, path: Path) -> dict | None:
+        """Cached digest (and imports) of a file, refreshed if its stat changed."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        name = _relative(path)
+        entry = self._files.get(name)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": _hash_file(path)}
+            if path.suffix == ".py":
+                entry["imports"] = _parse_imports(path)
+            self._files[name] = entry
+        return entry
+
+    def digest(self, path: Path) -> str:
+        entry = self._entry(path)
+        return entry["digest"] if entry else MISSING
+
+    def digests(self, paths) -> dict[str, str]:
+        return {_relative(path): self.digest(path) for path in paths}
+
+    def code_files(self, module: str) -> list[Path]:
+        """Source files of `module` and of every project module it imports, transitively."""
+        seen, stack = {}, [module]
+        while stack:
+            name = stack.pop()
+            path = _module_path(name)
+            if name in seen or path is None:
+                continue
+            seen[name] = path
+            stack.extend(self._entry(path).get("imports", []))
+        return sorted(set(seen.values()))
+
+    # ---------- STAGES ---------- #
+
+    def stage(self, name: str) -> dict | None:
+        return self._stages.get(name)
+
+    def record(self, name: str, key: str, inputs: dict, code: dict, params: dict, outputs: dict):
+        self._stages[name] = {
+            "key": key,
+            "inputs": inputs,
+            "code": code,
+            "params": params,
+            "outputs": outputs,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def forget(self, name: str):
+        self._stages.pop(name, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"files": self._files, "stages": self._stages}, indent=2), encoding="utf-8")
+        tmp.replace(self.path)      # atomic, like the state store
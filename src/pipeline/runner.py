@@ -0,0 +1,355 @@
+# src/pipeline/runner.py
+"""
+Pipeline runner: every stage, skipped when nothing it depends on changed.
+
+Each stage declares the files it reads and writes, and the function it runs.
+Like a build system, the runner hashes (see manifest.py):
+- its inputs: Takeout files, config files, the interim files earlier
+  stages wrote
+- its code: the stage module and every project module it imports
+- its parameters (e.g. the target warehouse for loads)
+and skips the stage if they match its last successful run and its outputs
+are untouched. A stage that reruns and writes different outputs makes the
+stages reading them rerun too; one that rewrites identical outputs does not.
+
+Stage modules are only imported when the stage runs, and unchanged files are
+never re-read, so a run with nothing to do takes a fraction of a second.
+Stale loads are run together by the load orchestrator, on one sink.
+
+With --takeout, the extractors read the Takeout archives (see
+src/common/takeout.py), and the archive parts of the export are hashed as
+their inputs instead of the unpacked files.
+
+Usage (from the project root):
+    python -m src.pipeline.runner [--dry-run] [--force [STAGE ...]] [--only STAGE ...] [--takeout [PATH]]
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.config.paths import (
+    DQ_THRESHOLDS_JSON,
+    GENRE_LOOKUP_CSV,
+    INTERIM_LIBRARY,
+    INTERIM_SPOTIFY_HISTORY,
+    INTERIM_SPOTIFY_LIBRARY,
+    INTERIM_WATCH_HISTORY,
+    LIBRARY_SONGS_CSV,
+    PLAYLISTS_ALLOWLIST_JSON,
+    PROJECT_ROOT,
+    RAW_TAKEOUT_ARCHIVES_DIR,
+    RAW_TAKEOUT_PLAYLISTS_DIR,
+    WATCH_HISTORY_JSON,
+)
+from src.common.takeout import export_parts
+from src.pipeline.manifest import Manifest, stage_key
+
+WAREHOUSE_ENV = "YT_WAREHOUSE"      # same variable as src/warehouse/sinks.py:get_sink()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    entrypoint: str                         # "module:function", imported when the stage runs
+    inputs: tuple = ()                      # files, or directories (every *.csv / *.json in them)
+    outputs: tuple = ()
+    load: str | None = None                 # load orchestrator task (run with the other loads)
+    params: dict = field(default_factory=dict, hash=False)
+    kwargs: dict = field(default_factory=dict, hash=False)     # passed to the entrypoint, not hashed
+
+    @property
+    def module(self) -> str:
+        return self.entrypoint.split(":")[0]
+
+
+# ============================================================
+# STAGES (in run order)
+# ============================================================
+
+def pipeline_stages(takeout: Path | None = None) -> list[Stage]:
+    """Every stage; with `takeout`, the extractors read that export's archives."""
+    warehouse = {"warehouse": (os.environ.get(WAREHOUSE_ENV) or "bigquery").lower()}
+
+    if takeout is not None:
+        archives = tuple(export_parts(takeout))
+        history_inputs, library_inputs = archives, archives
+        extract_kwargs = {"takeout": takeout}
+    else:
+        history_inputs = (WATCH_HISTORY_JSON,)
+        library_inputs = (LIBRARY_SONGS_CSV, RAW_TAKEOUT_PLAYLISTS_DIR)
+        extract_kwargs = {}
+
+    return [
+        # ---------- PRODUCT B: LISTENING HISTORY ---------- #
+        Stage(
+            "extract_watch_history",
+            "src.history.b1_extract_load.extract_watch_history:extract_watch_history_youtube_music",
+            inputs=(*history_inputs, DQ_THRESHOLDS_JSON),
+            outputs=(INTERIM_WATCH_HISTORY,),
+            kwargs=extract_kwargs,
+        ),
+        Stage(
+            "dq_watch_history",
+            "src.history.b1_extract_load.dq_check_watch_history_youtube_music:run_checks_and_analysis",
+            inputs=(INTERIM_WATCH_HISTORY,),
+        ),
+        Stage(
+            "enrich_history",
+            "src.history.b2_spotify_enrich.enrich_spotify_history:enrich_library_with_spotify",
+            inputs=(INTERIM_WATCH_HISTORY, DQ_THRESHOLDS_JSON),
+            outputs=(INTERIM_SPOTIFY_HISTORY,),
+        ),
+        Stage(
+            "dq_enriched_history",
+            "src.history.b2_spotify_enrich.dq_check_spotify_enriched_history:run_dq_checks",
+            inputs=(INTERIM_SPOTIFY_HISTORY,),
+        ),
+
+        # ---------- PRODUCT A: LIBRARY ---------- #
+        Stage(
+            "extract_library",
+            "src.library.a1_extract_load.extract_library_takeout:extract_library_and_playlists",
+            inputs=(*library_inputs, PLAYLISTS_ALLOWLIST_JSON, DQ_THRESHOLDS_JSON),
+            outputs=(INTERIM_LIBRARY,),
+            kwargs=extract_kwargs,
+        ),
+        Stage(
+            "dq_library",
+            "src.library.a1_extract_load.dq_check_library:run_dq_checks",
+            inputs=(INTERIM_LIBRARY,),
+        ),
+        Stage(
+            "enrich_library",
+            "src.library.a2_spotify_enrich.enrich_spotify_library:enrich_library_with_spotify",
+            inputs=(INTERIM_LIBRARY, DQ_THRESHOLDS_JSON),
+            outputs=(INTERIM_SPOTIFY_LIBRARY,),
+        ),
+        Stage(
+            "dq_enriched_library",
+            "src.library.a2_spotify_enrich.dq_check_spotify_enriched_library:run_dq_checks",
+            inputs=(INTERIM_SPOTIFY_LIBRARY,),
+        ),
+
+        # ---------- WAREHOUSE LOADS ---------- #
+        Stage(
+            "load_yt_history",
+            "src.history.b1_extract_load.load_history_bq:load_to_bigquery",
+            inputs=(INTERIM_WATCH_HISTORY, DQ_THRESHOLDS_JSON),
+            load="yt_history",
+            params=warehouse,
+        ),
+        Stage(
+            "load_spotify_history",
+            "src.history.b2_spotify_enrich.load_spotify_bq:load_spotify_enrichment",
+            inputs=(INTERIM_SPOTIFY_HISTORY, DQ_THRESHOLDS_JSON),
+            load="spotify_history",
+            params=warehouse,
+        ),
+        Stage(
+            "load_yt_library",
+            "src.library.a1_extract_load.load_library_bq:load_to_bigquery",
+            inputs=(INTERIM_LIBRARY, DQ_THRESHOLDS_JSON),
+            load="yt_library",
+            params=warehouse,
+        ),
+        Stage(
+            "load_spotify_library",
+            "src.library.a2_spotify_enrich.load_spotify_bq:load_spotify_enrichment",
+            inputs=(INTERIM_SPOTIFY_LIBRARY, DQ_THRESHOLDS_JSON),
+            load="spotify_library",
+            params=warehouse,
+        ),
+        Stage(
+            "load_genre_lookup",
+            "src.genre.load_genre_lookup_bq:load_genre_lookup",
+            inputs=(GENRE_LOOKUP_CSV,),
+            load="genre_lookup",
+            params=warehouse,
+        ),
+    ]
+
+
+def _input_files(paths) -> list[Path]:
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix in (".csv", ".json")))
+        else:
+            files.append(path)
+    return files
+
+
+def stage_inputs(stage: Stage, manifest: Manifest) -> tuple[dict, dict]:
+    """Digests of a stage's input files and of its code."""
+    inputs = manifest.digests(_input_files(stage.inputs))
+    code = manifest.digests(manifest.code_files(stage.module))
+    return inputs, code
+
+
+def stale_reason(stage: Stage, manifest: Manifest, key: str, inputs: dict, code: dict) -> str | None:
+    """Why `stage` must run (None if it is up to date)."""
+    record = manifest.stage(stage.name)
+    if record is None:
+        return "never run"
+
+    if record["key"] != key:
+        changed = [name for name, digest in inputs.items() if record["inputs"].get(name) != digest]
+        if changed:
+            return f"input changed: {', '.join(changed)}"
+        changed = [name for name, digest in code.items() if record["code"].get(name) != digest]
+        if changed:
+            return f"code changed: {', '.join(changed)}"
+        return "parameters changed"
+
+    for name, digest in record["outputs"].items():
+        if manifest.digest(PROJECT_ROOT / name) != digest:     # an absolute name stays as is
+            return f"output changed: {name}"
+    return None
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def _run_entrypoint(stage: Stage):
+    module, function = stage.entrypoint.split(":")
+    getattr(importlib.import_module(module), function)(**stage.kwargs)
+
+
+def _run_loads(stages: list[Stage]) -> dict[str, bool]:
+    """Stale loads, together on one sink; stage name -> success (all failed if no sink)."""
+    by_task = {stage.load: stage for stage in stages}
+
+    try:
+        from src.warehouse.orchestrator import load_tasks, report, run_loads, select
+        from src.warehouse.sinks import get_sink
+
+        tasks = select(load_tasks(), list(by_task))
+        sink = get_sink()
+    except Exception as e:
+        # e.g. no warehouse configured: the loads fail, finished stages stay recorded
+        print(f"❌ loads: {type(e).__name__}: {e}")
+        return {}
+
+    start = time.perf_counter()
+    try:
+        results = run_loads(tasks, sink)
+    except Exception as e:
+        print(f"❌ loads: {type(e).__name__}: {e}")
+        return {}
+    finally:
+        sink.close()
+    report(results, time.perf_counter() - start)
+
+    return {by_task[result.name].name: result.status == "done" for result in results}
+
+
+def run_pipeline(
+    only: list[str] | None = None,
+    force: list[str] | None = None,
+    dry_run: bool = False,
+    manifest: Manifest | None = None,
+    takeout: Path | None = None,
+) -> dict[str, str]:
+    """
+    Run every stale stage in order (or only `only`); `force` reruns stages
+    even if up to date (all of them if empty). Returns stage name -> status.
+
+    Raises RuntimeError once the manifest is saved if a stage or load failed.
+    """
+    start = time.perf_counter()
+    manifest = manifest or Manifest()
+    stages = pipeline_stages(takeout)
+
+    names = [stage.name for stage in stages]
+    unknown = (set(only or []) | set(force or [])) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))} (expected: {', '.join(names)})")
+    if only:
+        stages = [stage for stage in stages if stage.name in only]
+
+    statuses, pending_loads, failed = {}, [], []
+    for stage in stages:
+        if failed:
+            statuses[stage.name] = "blocked"
+            continue
+
+        inputs, code = stage_inputs(stage, manifest)
+        key = stage_key(inputs, code, stage.params)
+        reason = stale_reason(stage, manifest, key, inputs, code)
+        if force is not None and (not force or stage.name in force):
+            reason = "forced"
+
+        if reason is None:
+            statuses[stage.name] = "up to date"
+            print(f"⏩ {stage.name}: up to date")
+            continue
+
+        print(f"▶️ {stage.name}: {reason}")
+        if dry_run:
+            statuses[stage.name] = "stale"
+            continue
+
+        if stage.load:
+            # Loads are submitted together once the stages they read are done
+            pending_loads.append((stage, key, inputs, code))
+            continue
+
+        try:
+            _run_entrypoint(stage)
+        except Exception as e:
+            print(f"❌ {stage.name}: {type(e).__name__}: {e}")
+            manifest.forget(stage.name)
+            statuses[stage.name] = "failed"
+            failed.append(stage.name)
+        else:
+            manifest.record(stage.name, key, inputs, code, stage.params, manifest.digests(stage.outputs))
+            statuses[stage.name] = "done"
+        manifest.save()
+
+    if pending_loads and not failed:
+        succeeded = _run_loads([stage for stage, *_ in pending_loads])
+        for stage, key, inputs, code in pending_loads:
+            if succeeded.get(stage.name):
+                manifest.record(stage.name, key, inputs, code, stage.params, {})
+                statuses[stage.name] = "done"
+            else:
+                manifest.forget(stage.name)
+                statuses[stage.name] = "failed"
+                failed.append(stage.name)
+        manifest.save()
+    else:
+        for stage, *_ in pending_loads:
+            statuses[stage.name] = "blocked"
+
+    if not dry_run:
+        manifest.save()     # refreshed file digests, even when nothing ran
+
+    ran = sum(status == "done" for status in statuses.values())
+    print(f"⏱️ {ran}/{len(statuses)} stages run in {time.perf_counter() - start:.2f}s")
+
+    if failed:
+        raise RuntimeError(f"{len(failed)} stage(s) failed: {', '.join(failed)}")
+    return statuses
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pipeline, skipping stages whose inputs did not change.")
+    parser.add_argument("--only", nargs="+", metavar="STAGE",
+                        help="Consider only these stages.")
+    parser.add_argument("--force", nargs="*", metavar="STAGE",
+                        help="Rerun these stages even if up to date (every stage if none given).")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only print which stages would run, and why.")
+    parser.add_argument("--takeout", nargs="?", type=Path, const=RAW_TAKEOUT_ARCHIVES_DIR, metavar="PATH",
+                        help="Extract straight from the Takeout archives: a directory (newest export) or one part.")
+    args = parser.parse_args()
+
+    try:
+        run_pipeline(only=args.only, force=args.force, dry_run=args.dry_run, takeout=args.takeout)
+    except (RuntimeError, FileNotFoundError) as e:      # failed stages, or no Takeout archives found
+        sys.exit(f"❌ {e}")
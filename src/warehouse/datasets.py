@@ -0,0 +1,86 @@
+# src/warehouse/datasets.py
+"""
+Raw warehouse tables, declared once.
+
+Each table has its name in the raw dataset, its schema (the Arrow schema of
+the interim dataset it is loaded from), its physical layout (day
+partitioning column, clustering columns) and its write mode: a full load
+replaces the table, an incremental load MERGEs new rows on `merge_keys`.
+Sinks (sinks.py) derive their DDL / load schemas from these declarations.
+"""
+from dataclasses import dataclass
+
+import pyarrow as pa
+
+from src.common.interim import (
+    LIBRARY_CLEAN,
+    SPOTIFY_ENRICHED_HISTORY,
+    SPOTIFY_ENRICHED_LIBRARY,
+    WATCH_HISTORY,
+)
+from src.config.paths import GENRE_LOOKUP_CSV
+
+TRUNCATE = "truncate"
+MERGE = "merge"
+
+
+@dataclass(frozen=True)
+class WarehouseTable:
+    name: str
+    schema: pa.Schema
+    merge_keys: tuple[str, ...] = ()    # event key for incremental MERGE loads
+    partition_by: str | None = None     # TIMESTAMP/DATE column, partitioned by day
+    cluster_by: tuple[str, ...] = ()
+
+    @property
+    def columns(self) -> list[str]:
+        return self.schema.names
+
+    def write_mode(self, incremental: bool = False) -> str:
+        if incremental and not self.merge_keys:
+            raise ValueError(f"{self.name} has no merge keys: incremental loads are not supported")
+        return MERGE if incremental else TRUNCATE
+
+
+# ============================================================
+# TABLES
+# ============================================================
+
+RAW_WATCH_HISTORY = WarehouseTable(
+    name="raw_watch_history_youtube_music",
+    schema=WATCH_HISTORY.schema,
+    merge_keys=("listening_id",),           # INT64 play key computed at extraction
+    partition_by="played_at",
+    cluster_by=("artist", "track_id"),
+)
+
+RAW_LIBRARY = WarehouseTable(
+    name="raw_library",
+    schema=LIBRARY_CLEAN.schema,
+    cluster_by=("track_id",),
+)
+
+RAW_SPOTIFY_HISTORY = WarehouseTable(
+    name="raw_spotify_history",
+    schema=SPOTIFY_ENRICHED_HISTORY.schema,
+    merge_keys=("listening_id",),
+    partition_by="source_played_at",
+    cluster_by=("spotify_artist_id", "spotify_track_id"),
+)
+
+RAW_SPOTIFY_LIBRARY = WarehouseTable(
+    name="raw_spotify_library",
+    schema=SPOTIFY_ENRICHED_LIBRARY.schema,
+    cluster_by=("source_track_id",),
+)
+
+GENRE_LOOKUP = WarehouseTable(
+    name="genre_lookup",
+    schema=pa.schema([
+        ("spotify_raw_genre", pa.string()),
+        ("main_genre", pa.string()),
+        ("sub_genre", pa.string()),
+    ]),
+)
+
+GENRE_LOOKUP_FILE = GENRE_LOOKUP_CSV
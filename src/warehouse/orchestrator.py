@@ -0,0 +1,217 @@
+# src/warehouse/orchestrator.py
+"""
+Load orchestrator: every raw table load in one run.
+
+Instead of running the five loader scripts one after the other, each with
+its own client and each waiting on its own job, the orchestrator:
+- builds one warehouse sink (one BigQuery client) shared by every load
+- submits all loads whose dependencies are met at the same time, each on a
+  thread of a small pool, and waits on the running jobs together
+- reports each job's rows, bytes and duration (LoadStats), and the run's
+  wall time against the sum of the job times
+
+The loads themselves are independent; the only dependency is the incremental
+high-water mark, committed once both history loads have succeeded. A failed
+load fails the run, and what depends on it is skipped.
+
+Usage (from the project root):
+    python -m src.warehouse.orchestrator [--incremental] [--only yt_history spotify_history]
+"""
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.genre.load_genre_lookup_bq import load_genre_lookup
+from src.history.b1_extract_load.load_history_bq import load_to_bigquery as load_yt_history
+from src.history.b2_spotify_enrich.load_spotify_bq import commit_mark
+from src.history.b2_spotify_enrich.load_spotify_bq import load_spotify_enrichment as load_spotify_history
+from src.library.a1_extract_load.load_library_bq import load_to_bigquery as load_yt_library
+from src.library.a2_spotify_enrich.load_spotify_bq import load_spotify_enrichment as load_spotify_library
+from src.warehouse.sinks import get_sink
+
+
+@dataclass(frozen=True)
+class LoadTask:
+    name: str
+    run: Callable                           # run(sink) -> LoadStats | None
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class TaskResult:
+    name: str
+    status: str                             # "done", "failed" or "skipped"
+    seconds: float = 0.0
+    stats: object = None                    # LoadStats, when the task loaded something
+    error: BaseException | None = field(default=None, repr=False)
+
+
+# ============================================================
+# LOAD GRAPH
+# ============================================================
+
+def load_tasks(incremental: bool = False) -> list[LoadTask]:
+    """The raw table loads, and what each one waits for."""
+    tasks = [
+        LoadTask("yt_history", lambda sink: load_yt_history(incremental=incremental, sink=sink)),
+        LoadTask("yt_library", lambda sink: load_yt_library(sink=sink)),
+        LoadTask(
+            "spotify_history",
+            lambda sink: load_spotify_history(incremental=incremental, sink=sink, commit=False),
+        ),
+        LoadTask("spotify_library", lambda sink: load_spotify_library(sink=sink)),
+        LoadTask("genre_lookup", lambda sink: load_genre_lookup(sink=sink)),
+    ]
+
+    if incremental:
+        # The mark moves only once the plays are in both history tables
+        tasks.append(LoadTask(
+            "history_mark",
+            lambda sink: _commit_mark(),
+            depends_on=("yt_history", "spotify_history"),
+        ))
+
+    return tasks
+
+
+def _commit_mark():
+    commit_mark()           # not a load: nothing to report
+
+
+def select(tasks: list[LoadTask], names: list[str] | None) -> list[LoadTask]:
+    """`names` and everything they depend on (all tasks if None)."""
+    if not names:
+        return tasks
+
+    by_name = {task.name: task for task in tasks}
+    unknown = set(names) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown load(s): {', '.join(sorted(unknown))} (expected: {', '.join(by_name)})")
+
+    wanted, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(by_name[name].depends_on)
+
+    # Tasks that only exist to follow a selected load (the mark) come along
+    for task in tasks:
+        if task.depends_on and set(task.depends_on) <= wanted:
+            wanted.add(task.name)
+
+    return [task for task in tasks if task.name in wanted]
+
+
+# ============================================================
+# SCHEDULER
+# ============================================================
+
+def _timed(task: LoadTask, sink) -> tuple[object, float]:
+    start = time.perf_counter()
+    stats = task.run(sink)
+    return stats, time.perf_counter() - start
+
+
+def run_loads(tasks: list[LoadTask], sink, workers: int | None = None) -> list[TaskResult]:
+    """Run every task as soon as its dependencies are done; results in task order."""
+    by_name = {task.name: task for task in tasks}
+    for task in tasks:
+        missing = set(task.depends_on) - set(by_name)
+        if missing:
+            raise ValueError(f"{task.name} depends on unknown load(s): {', '.join(sorted(missing))}")
+
+    results: dict[str, TaskResult] = {}
+    waiting = list(tasks)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=workers or len(tasks)) as pool:
+        while waiting or running:
+            # ---------- SUBMIT EVERY TASK WHOSE DEPENDENCIES ARE MET ---------- #
+            for task in list(waiting):
+                states = [results[dep].status for dep in task.depends_on if dep in results]
+                if any(state != "done" for state in states):
+                    waiting.remove(task)
+                    results[task.name] = TaskResult(task.name, "skipped")
+                    print(f"⏭️ {task.name}: skipped (a dependency failed)")
+                elif len(states) == len(task.depends_on):
+                    waiting.remove(task)
+                    running[pool.submit(_timed, task, sink)] = task
+
+            if not running:
+                if waiting:
+                    raise ValueError(f"Dependency cycle between: {', '.join(task.name for task in waiting)}")
+                continue
+
+            # ---------- WAIT ON ALL RUNNING JOBS TOGETHER ---------- #
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                try:
+                    stats, seconds = future.result()
+                    results[task.name] = TaskResult(task.name, "done", seconds, stats)
+                    print(f"✅ {task.name}: done in {seconds:.1f}s")
+                except Exception as e:
+                    results[task.name] = TaskResult(task.name, "failed", error=e)
+                    print(f"❌ {task.name}: {type(e).__name__}: {e}")
+
+    return [results[task.name] for task in tasks]
+
+
+def report(results: list[TaskResult], wall_seconds: float):
+    print(f"\n📊 {'load':<16} {'status':<8} {'rows':>10} {'MB':>8} {'seconds':>8}")
+    for result in results:
+        rows = f"{result.stats.rows}" if result.stats else "-"
+        size = f"{result.stats.bytes / 1e6:.1f}" if result.stats else "-"
+        print(f"   {result.name:<16} {result.status:<8} {rows:>10} {size:>8} {result.seconds:>8.1f}")
+
+    total = sum(result.seconds for result in results)
+    print(f"⏱️ Wall time {wall_seconds:.1f}s for {total:.1f}s of load jobs")
+
+
+# ============================================================
+# ENTRYPOINT
+# ============================================================
+
+def orchestrate_loads(
+    incremental: bool = False,
+    only: list[str] | None = None,
+    sink=None,
+    workers: int | None = None,
+) -> list[TaskResult]:
+    tasks = select(load_tasks(incremental), only)
+    print(f"➡️ Submitting {len(tasks)} loads: {', '.join(task.name for task in tasks)}")
+
+    own_sink = sink is None
+    sink = sink or get_sink()       # one client shared by every load
+
+    start = time.perf_counter()
+    try:
+        results = run_loads(tasks, sink, workers)
+    finally:
+        if own_sink:
+            sink.close()
+
+    report(results, time.perf_counter() - start)
+
+    failed = [result for result in results if result.status == "failed"]
+    if failed:
+        raise RuntimeError(f"{len(failed)} load(s) failed: {', '.join(result.name for result in failed)}") \
+            from failed[0].error
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load every raw table into the warehouse, concurrently.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Merge the history loads and commit the high-water mark once both succeed.")
+    parser.add_argument("--only", nargs="+", metavar="LOAD",
+                        help="Run only these loads (and what they depend on).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Loads running at the same time (default: all of them).")
+    args = parser.parse_args()
+
+    orchestrate_loads(incremental=args.incremental, only=args.only, workers=args.workers)
@@ -0,0 +1,287 @@
+# src/warehouse/sinks.py
+"""
+Warehouse sinks: where the loaders write the raw tables.
+
+- BigQuerySink: the production warehouse (ytmusic_raw dataset, EU)
+- DuckDBSink: a local DuckDB file with the same tables, to run the whole
+  pipeline and benchmark loads offline without paying BigQuery job latency
+
+The sink is picked with the YT_WAREHOUSE environment variable
+("bigquery", the default, or "duckdb"). Both implement the same
+`load(table, data, incremental)` contract, `data` being a typed Parquet
+file (the interim datasets are loaded as-is, never re-encoded) or a
+DataFrame: a full load replaces the table, an incremental load inserts the
+rows whose merge keys are not in it yet, so replaying a load never
+duplicates rows. Every load returns a LoadStats (rows, bytes, seconds).
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.common.interim import to_arrow
+from src.config.paths import SECRETS_DIR, WAREHOUSE_DIR
+from src.warehouse.datasets import MERGE, WarehouseTable
+
+WAREHOUSE_ENV = "YT_WAREHOUSE"
+
+BIGQUERY_PROJECT = "ytmusic-analytics-478417"
+RAW_DATASET = "ytmusic_raw"
+BIGQUERY_LOCATION = "EU"
+SERVICE_ACCOUNT = SECRETS_DIR / "ytmusic-analytics-478417-692a6c5d2282.json"
+
+DUCKDB_FILE = WAREHOUSE_DIR / "ytmusic.duckdb"
+
+
+@dataclass
+class LoadStats:
+    """What one load job did, logged by the loaders."""
+    table: str
+    sink: str
+    mode: str
+    rows: int
+    bytes: int
+    seconds: float
+
+    def __str__(self):
+        return (
+            f"{self.table} ({self.sink}, {self.mode}): {self.rows} rows written, "
+            f"{self.bytes / 1e6:.1f} MB uploaded in {self.seconds:.1f}s"
+        )
+
+
+def _merge_condition(table: WarehouseTable, target: str = "t", source: str = "s") -> str:
+    # NULL-safe match: a play without video ID still has a unique key
+    return " and ".join(
+        f"{target}.{key} is not distinct from {source}.{key}" for key in table.merge_keys
+    )
+
+
+@contextmanager
+def as_parquet(table: WarehouseTable, data):
+    """
+    Path of a Parquet file holding `data` with the table schema.
+
+    Interim datasets already are typed Parquet files and are used as-is;
+    DataFrames (e.g. the genre CSV) are written to a temporary file first.
+    """
+    if isinstance(data, (str, Path)):
+        yield Path(data)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"{table.name}.parquet"
+        pq.write_table(to_arrow(data, table), path)
+        yield path
+
+
+# ============================================================
+# BIGQUERY
+# ============================================================
+
+_BIGQUERY_TYPES = {
+    pa.string(): "STRING",
+    pa.int64(): "INTEGER",
+    pa.float64(): "FLOAT",
+    pa.bool_(): "BOOLEAN",
+    pa.date32(): "DATE",
+}
+
+
+def bigquery_type(arrow_type: pa.DataType) -> str:
+    if pa.types.is_timestamp(arrow_type):
+        return "TIMESTAMP"
+    return _BIGQUERY_TYPES[arrow_type]
+
+
+class BigQuerySink:
+    name = "bigquery"
+
+    def __init__(
+        self,
+        project: str = BIGQUERY_PROJECT,
+        dataset: str = RAW_DATASET,
+        location: str = BIGQUERY_LOCATION,
+        service_account=SERVICE_ACCOUNT,
+        client=None,
+    ):
+        from google.cloud import bigquery
+
+        self._bigquery = bigquery
+        self.project = project
+        self.dataset = dataset
+        self.location = location
+        self.client = client or bigquery.Client.from_service_account_json(str(service_account))
+
+    def table_id(self, table: WarehouseTable) -> str:
+        return f"{self.project}.{self.dataset}.{table.name}"
+
+    def schema(self, table: WarehouseTable) -> list:
+        return [
+            self._bigquery.SchemaField(field.name, bigquery_type(field.type))
+            for field in table.schema
+        ]
+
+    def job_config(self, table: WarehouseTable, layout: bool = True):
+        """Parquet load with the declared schema (no autodetect pass) and layout."""
+        bigquery = self._bigquery
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            autodetect=False,
+            schema=self.schema(table),
+        )
+        if layout and table.partition_by:
+            job_config.time_partitioning = bigquery.TimePartitioning(
+                type_=bigquery.TimePartitioningType.DAY,
+                field=table.partition_by,
+            )
+        if layout and table.cluster_by:
+            job_config.clustering_fields = list(table.cluster_by)
+        return job_config
+
+    def _existing(self, table_id: str):
+        from google.api_core.exceptions import NotFound
+
+        try:
+            return self.client.get_table(table_id)
+        except NotFound:
+            return None
+
+    def _drop_if_layout_changed(self, table: WarehouseTable, table_id: str):
+        """A WRITE_TRUNCATE cannot change partitioning/clustering: recreate the table."""
+        existing = self._existing(table_id)
+        if existing is None:
+            return
+
+        partition_by = existing.time_partitioning.field if existing.time_partitioning else None
+        if partition_by != table.partition_by or list(existing.clustering_fields or []) != list(table.cluster_by):
+            print(f"♻️ {table_id}: partitioning/clustering changed, recreating the table")
+            self.client.delete_table(table_id)
+
+    def _load_file(self, path: Path, table_id: str, job_config):
+        with open(path, "rb") as f:
+            job = self.client.load_table_from_file(
+                f, table_id, job_config=job_config, location=self.location
+            )
+        job.result()
+        return job
+
+    def load(self, table: WarehouseTable, data, incremental: bool = False) -> LoadStats:
+        """Load a Parquet file (or DataFrame) into the table."""
+        table_id = self.table_id(table)
+        mode = table.write_mode(incremental)
+        start = time.perf_counter()
+
+        with as_parquet(table, data) as path:
+            size = path.stat().st_size
+
+            if mode == MERGE and self._existing(table_id) is not None:
+                rows = self._merge(table, table_id, path)
+            else:
+                # Full load (or first incremental load: nothing to merge into)
+                self._drop_if_layout_changed(table, table_id)
+                job = self._load_file(path, table_id, self.job_config(table))
+                rows = job.output_rows
+
+        return LoadStats(table_id, self.name, mode, rows, size, time.perf_counter() - start)
+
+    def _merge(self, table: WarehouseTable, table_id: str, path: Path) -> int:
+        # New rows go to a staging table, then are MERGEd on the event key
+        staging_id = f"{table_id}__staging"
+        self._load_file(path, staging_id, self.job_config(table, layout=False))
+
+        query = f"""
+            merge `{table_id}` t
+            using `{staging_id}` s
+            on {_merge_condition(table)}
+            when not matched then insert row
+        """
+
+        try:
+            job = self.client.query(query, location=self.location)
+            job.result()
+        finally:
+            self.client.delete_table(staging_id, not_found_ok=True)
+
+        return job.num_dml_affected_rows or 0
+
+    def close(self):
+        self.client.close()
+
+
+# ============================================================
+# DUCKDB
+# ============================================================
+
+class DuckDBSink:
+    name = "duckdb"
+
+    def __init__(self, path=DUCKDB_FILE, dataset: str = RAW_DATASET):
+        import duckdb
+
+        self.path = path
+        self.dataset = dataset
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = duckdb.connect(str(path))
+        self._conn.execute(f"create schema if not exists {dataset}")
+
+    def table_id(self, table: WarehouseTable) -> str:
+        return f"{self.dataset}.{table.name}"
+
+    def load(self, table: WarehouseTable, data, incremental: bool = False) -> LoadStats:
+        """Load a Parquet file (or DataFrame) into the table."""
+        table_id = self.table_id(table)
+        mode = table.write_mode(incremental)
+        start = time.perf_counter()
+
+        # One cursor (own connection to the same database) per load: loads of
+        # different tables run concurrently, e.g. from the load orchestrator
+        with as_parquet(table, data) as path, self._conn.cursor() as conn:
+            size = path.stat().st_size
+            # Scanned straight from the file, never materialized in pandas
+            source = [str(path)]
+            if mode != MERGE:
+                conn.execute(f"create or replace table {table_id} as select * from read_parquet(?)", source)
+                rows = conn.execute(f"select count(*) from {table_id}").fetchone()[0]
+            else:
+                conn.execute(
+                    f"create table if not exists {table_id} as select * from read_parquet(?) where false",
+                    source,
+                )
+                rows = conn.execute(f"""
+                    insert into {table_id}
+                    select * from read_parquet(?) s
+                    where not exists (
+                        select 1 from {table_id} t where {_merge_condition(table)}
+                    )
+                """, source).fetchone()[0]
+
+        return LoadStats(table_id, self.name, mode, rows, size, time.perf_counter() - start)
+
+    def close(self):
+        self._conn.close()
+
+
+# ============================================================
+# SELECTION
+# ============================================================
+
+SINKS = {
+    BigQuerySink.name: BigQuerySink,
+    DuckDBSink.name: DuckDBSink,
+}
+
+
+def get_sink(name: str | None = None):
+    """Sink named `name`, or by $YT_WAREHOUSE (default: bigquery)."""
+    name = (name or os.environ.get(WAREHOUSE_ENV) or BigQuerySink.name).lower()
+    if name not in SINKS:
+        raise ValueError(f"Unknown warehouse '{name}' (expected one of: {', '.join(SINKS)})")
+    return SINKS[name]()